@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
 """
 Fetch EA FC 25 player data from SoFIFA and generate SQL seed file
-Usage: python fetch-eafc25-players.py
+Usage: python fetch-eafc25-players.py [--csv [--all-leagues | --league NAME] [--limit N]
+                                             [--format sql|copy|csv] [--batch-size N]
+                                             [--snapshot FILE]]
+       python fetch-eafc25-players.py --snapshot FILE --commit-snapshot
 """
 
 import csv
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import sys
+import tempfile
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 def map_position(pos: str) -> str:
     """Map SoFIFA position to our position format"""
@@ -51,71 +62,294 @@ def calculate_rarity(overall: int) -> str:
     else:
         return 'bronze'
 
+PLAYER_COLUMNS = "name, position, team_real, overall_rating, pace, shooting, passing, dribbling, defending, physicality, price_ball, total_shares, available_shares, rarity"
+
+OUTPUT_FORMATS = ("sql", "copy", "csv")
+
+# Columns refreshed when an existing player changes; share counts are owned by the market
+UPSERT_COLUMNS = ["position", "team_real", "overall_rating", "pace", "shooting", "passing",
+                  "dribbling", "defending", "physicality", "price_ball", "rarity"]
+
+# Tables referencing players without ON DELETE CASCADE (see DEPLOY.sql)
+PLAYER_REFERENCES = ("match_events", "transfers", "user_holdings", "player_cards")
+
 def escape_sql(s: str) -> str:
     """Escape SQL string"""
     return s.replace("'", "''")
 
-def process_csv_to_sql(csv_path: str, output_path: str):
-    """Convert EA FC 25 CSV to PostgreSQL INSERT statements"""
-    
-    players = []
+def escape_copy(s: str) -> str:
+    """Escape a value for COPY text format"""
+    return s.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+def escape_csv(s: str) -> str:
+    """Quote a value for COPY csv format when needed"""
+    if any(c in s for c in ',"\n\r'):
+        return '"' + s.replace('"', '""') + '"'
+    return s
+
+def player_values(p: dict) -> list:
+    """Column values in PLAYER_COLUMNS order"""
+    return [p['name'], p['position'], p['team_real'], p['overall_rating'], p['pace'], p['shooting'],
+            p['passing'], p['dribbling'], p['defending'], p['physicality'], p['price_ball'], 1000, 1000, p['rarity']]
+
+def parse_player(row: dict) -> dict:
+    """Turn one SoFIFA CSV row into a players table row"""
+    player = {
+        'name': row['name'].strip(),
+        'team_real': row.get('club_name', 'Unknown').strip(),
+        'position': map_position(row.get('club_position', 'CM')),
+        'overall_rating': int(row.get('overall_rating', 70)),
+        'pace': int(row.get('pace', 70)),
+        'shooting': int(row.get('shooting', 70)),
+        'passing': int(row.get('passing', 70)),
+        'dribbling': int(row.get('dribbling', 70)),
+        'defending': int(row.get('defending', 50)),
+        'physicality': int(row.get('physicality', 70)),
+    }
     
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Only Premier League players
-            if 'Premier League' not in row.get('club_league_name', ''):
+    # Calculate price based on overall rating
+    player['price_ball'] = calculate_price(player['overall_rating'])
+    player['rarity'] = calculate_rarity(player['overall_rating'])
+    return player
+
+def iter_players(csv_path: str, league: Optional[str] = 'Premier League') -> Iterator[dict]:
+    """Stream players from the CSV, optionally keeping a single league"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if league and league not in row.get('club_league_name', ''):
                 continue
-                
-            player = {
-                'name': row['name'].strip(),
-                'team_real': row.get('club_name', 'Unknown').strip(),
-                'position': map_position(row.get('club_position', 'CM')),
-                'overall_rating': int(row.get('overall_rating', 70)),
-                'pace': int(row.get('pace', 70)),
-                'shooting': int(row.get('shooting', 70)),
-                'passing': int(row.get('passing', 70)),
-                'dribbling': int(row.get('dribbling', 70)),
-                'defending': int(row.get('defending', 50)),
-                'physicality': int(row.get('physicality', 70)),
-            }
-            
-            # Calculate price based on overall rating
-            player['price_ball'] = calculate_price(player['overall_rating'])
-            player['rarity'] = calculate_rarity(player['overall_rating'])
-            
-            players.append(player)
-    
-    # Sort by overall rating
-    players.sort(key=lambda x: x['overall_rating'], reverse=True)
-    
-    # Generate SQL
-    sql_lines = [
+            yield parse_player(row)
+
+def _rating(player: dict) -> int:
+    return player['overall_rating']
+
+def _chunks(players: Iterable[dict], chunk_size: int) -> Iterator[List[dict]]:
+    chunk = []
+    for player in players:
+        chunk.append(player)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _spill(chunk: List[dict], directory: str, index: int) -> str:
+    path = os.path.join(directory, f"run-{index:05d}.jsonl")
+    with open(path, 'w', encoding='utf-8') as f:
+        for player in chunk:
+            f.write(json.dumps(player, ensure_ascii=False) + "\n")
+    return path
+
+def _read_run(path: str) -> Iterator[dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+def sort_players(players: Iterable[dict], chunk_size: int = 50000,
+                 limit: Optional[int] = None) -> Iterator[dict]:
+    """
+    Yield players by overall rating (highest first) with bounded memory.
+    
+    With a limit only the top-K are kept on a heap. Otherwise rows are sorted
+    in chunks, spilled to temporary runs and k-way merged. Ties keep input
+    order, same as list.sort.
+    """
+    if limit is not None:
+        yield from heapq.nlargest(limit, players, key=_rating)
+        return
+    
+    chunks = _chunks(players, chunk_size)
+    first = next(chunks, [])
+    second = next(chunks, None)
+    if second is None:
+        # Everything fit in one chunk, no need to touch disk
+        first.sort(key=_rating, reverse=True)
+        yield from first
+        return
+    
+    with tempfile.TemporaryDirectory(prefix="eafc25-sort-") as tmp:
+        runs = []
+        for chunk in itertools.chain([first, second], chunks):
+            chunk.sort(key=_rating, reverse=True)
+            runs.append(_spill(chunk, tmp, len(runs)))
+        del first, second, chunk  # only the merge heads stay in memory
+        yield from heapq.merge(*(_read_run(path) for path in runs), key=_rating, reverse=True)
+
+def _sql_row(p: dict) -> str:
+    return f"    ('{escape_sql(p['name'])}', '{p['position']}', '{escape_sql(p['team_real'])}', {p['overall_rating']}, {p['pace']}, {p['shooting']}, {p['passing']}, {p['dribbling']}, {p['defending']}, {p['physicality']}, {p['price_ball']}, 1000, 1000, '{p['rarity']}')"
+
+def _copy_row(p: dict) -> str:
+    return "\t".join(escape_copy(str(v)) for v in player_values(p))
+
+def _csv_row(p: dict) -> str:
+    return ",".join(escape_csv(str(v)) for v in player_values(p))
+
+# format -> (statement opening a batch, row renderer, row separator, batch terminator)
+_BATCH_WRITERS = {
+    "sql": (f"INSERT INTO players ({PLAYER_COLUMNS}) VALUES", _sql_row, ",", ";"),
+    "copy": (f"COPY players ({PLAYER_COLUMNS}) FROM STDIN;", _copy_row, "", "\n\\."),
+    "csv": (f"COPY players ({PLAYER_COLUMNS}) FROM STDIN WITH (FORMAT csv);", _csv_row, "", "\n\\."),
+}
+
+def _write_header(out, title: str, statement: str):
+    out.write('\n'.join([
         "-- ============================================",
-        "-- EA FC 25 PREMIER LEAGUE PLAYERS",
+        f"-- {title}",
         "-- Generated from SoFIFA data",
         "-- ============================================",
         "",
-        "TRUNCATE TABLE players CASCADE;",
+        statement,
         "",
-        "INSERT INTO players (name, position, team_real, overall_rating, pace, shooting, passing, dribbling, defending, physicality, price_ball, total_shares, available_shares, rarity) VALUES",
-    ]
-    
-    for i, p in enumerate(players):
-        values = f"    ('{escape_sql(p['name'])}', '{p['position']}', '{escape_sql(p['team_real'])}', {p['overall_rating']}, {p['pace']}, {p['shooting']}, {p['passing']}, {p['dribbling']}, {p['defending']}, {p['physicality']}, {p['price_ball']}, 1000, 1000, '{p['rarity']}')"
-        if i < len(players) - 1:
-            values += ","
+    ]))
+
+def _write_batches(out, rows: Iterable[dict], opening: str, render, separator: str,
+                   terminator: str, batch_size: int) -> int:
+    """Write rows as statements of at most batch_size rows; returns the count"""
+    count = 0
+    for p in rows:
+        if count % batch_size == 0:
+            if count:
+                out.write(terminator + "\n")
+            out.write("\n" + opening)
         else:
-            values += ";"
-        sql_lines.append(values)
+            out.write(separator)
+        out.write("\n" + render(p))
+        count += 1
+    
+    if count:
+        out.write(terminator)
+    return count
+
+def write_sql(players: Iterable[dict], output_path: str, title: str,
+              fmt: str = "sql", batch_size: int = 5000) -> int:
+    """
+    Write players row by row as a psql script; returns the count.
+    
+    Rows are grouped into statements of at most batch_size: multi-row
+    INSERTs for "sql", COPY ... FROM STDIN data blocks for "copy" (text)
+    and "csv".
+    """
+    opening, render, separator, terminator = _BATCH_WRITERS[fmt]
+    with open(output_path, 'w', encoding='utf-8') as out:
+        _write_header(out, title, "TRUNCATE TABLE players CASCADE;")
+        count = _write_batches(out, players, opening, render, separator, terminator, batch_size)
+        out.write(f"\n\n-- Total players: {count}")
+    return count
+
+def player_fingerprint(p: dict) -> str:
+    """Stable hash of a player's identity and stats"""
+    fields = [p['name'], p['team_real'], p['position'], p['overall_rating'], p['pace'], p['shooting'],
+              p['passing'], p['dribbling'], p['defending'], p['physicality']]
+    return hashlib.sha1("\x1f".join(str(v) for v in fields).encode('utf-8')).hexdigest()
+
+def load_snapshot(snapshot_path: str) -> Dict[str, str]:
+    """Player name -> fingerprint from a previous run; empty if there is none"""
+    snapshot = {}
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                name, fingerprint = json.loads(line)
+                snapshot[name] = fingerprint
+    return snapshot
+
+def pending_snapshot_path(snapshot_path: str) -> str:
+    return snapshot_path + ".pending"
+
+def promote_snapshot(snapshot_path: str) -> bool:
+    """Make the pending snapshot current once its SQL has been applied"""
+    pending = pending_snapshot_path(snapshot_path)
+    if not os.path.exists(pending):
+        return False
+    os.replace(pending, snapshot_path)
+    return True
+
+def save_snapshot(snapshot: Dict[str, str], snapshot_path: str):
+    """Atomically replace the snapshot file"""
+    tmp_path = snapshot_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for name, fingerprint in snapshot.items():
+            f.write(json.dumps([name, fingerprint], ensure_ascii=False) + "\n")
+    os.replace(tmp_path, snapshot_path)
+
+def write_diff_sql(players: Iterable[dict], output_path: str, snapshot_path: str,
+                   title: str, batch_size: int = 5000) -> Tuple[int, int, int]:
+    """
+    Write UPSERTs for new or changed players and DELETEs for removed ones.
     
-    sql_lines.append("")
-    sql_lines.append(f"-- Total players: {len(players)}")
+    Players are matched by name (players_name_key) against the fingerprints
+    in snapshot_path. The current data is written to the pending snapshot
+    beside it, to be promoted with promote_snapshot() once the SQL has been
+    applied; until then every run diffs against the last applied state, so
+    nothing is lost if the SQL fails or is never run. Share counts are left
+    alone on update. players should come from sort_players, so that when
+    names repeat the highest rated one is kept, as in the full load.
+
+    The statements run in one transaction. Removed players still referenced
+    by tables without ON DELETE CASCADE (match history, transfers, holdings,
+    cards) are kept rather than failing the delete.
+    Returns (upserted, deleted, unchanged), deleted counting those candidates.
+    """
+    previous = load_snapshot(snapshot_path)
+    current: Dict[str, str] = {}
+    unchanged = 0
+    
+    def changed_players() -> Iterator[dict]:
+        nonlocal unchanged
+        for p in players:
+            if p['name'] in current:
+                continue  # names are unique in the table, first (highest rated when sorted) wins
+            fingerprint = current[p['name']] = player_fingerprint(p)
+            if previous.get(p['name']) == fingerprint:
+                unchanged += 1
+                continue
+            yield p
+    
+    updated = ", ".join(f"{column} = EXCLUDED.{column}" for column in UPSERT_COLUMNS)
+    with open(output_path, 'w', encoding='utf-8') as out:
+        _write_header(out, title, "-- Incremental update: only new, changed and removed players\nBEGIN;")
+        upserted = _write_batches(out, changed_players(), f"INSERT INTO players ({PLAYER_COLUMNS}) VALUES",
+                                  _sql_row, ",", f"\nON CONFLICT (name) DO UPDATE SET {updated};", batch_size)
+        removed = sorted(set(previous) - set(current))
+        if upserted and removed:
+            out.write("\n")
+        still_referenced = "".join(f"\n  AND NOT EXISTS (SELECT 1 FROM {table} r WHERE r.player_id = p.id)"
+                                   for table in PLAYER_REFERENCES)
+        deleted = _write_batches(out, removed, "DELETE FROM players p WHERE p.name IN (",
+                                 lambda name: f"    '{escape_sql(name)}'", ",", f"\n){still_referenced};",
+                                 batch_size)
+        out.write(f"\n\nCOMMIT;\n\n-- Upserted: {upserted}, deleted: {deleted}, unchanged: {unchanged}")
+    
+    save_snapshot(current, pending_snapshot_path(snapshot_path))
+    return upserted, deleted, unchanged
+
+def process_csv_to_sql(csv_path: str, output_path: str, league: Optional[str] = 'Premier League',
+                       chunk_size: int = 50000, limit: Optional[int] = None,
+                       fmt: str = "sql", batch_size: int = 5000):
+    """Convert EA FC 25 CSV to PostgreSQL INSERT statements or COPY blocks"""
+    
+    players = sort_players(iter_players(csv_path, league), chunk_size=chunk_size, limit=limit)
+    label = f"{league} players" if league else "players"
+    count = write_sql(players, output_path, f"EA FC 25 {label.upper()}", fmt=fmt, batch_size=batch_size)
     
-    Path(output_path).write_text('\n'.join(sql_lines))
-    print(f"✅ Generated SQL with {len(players)} Premier League players")
+    print(f"✅ Generated SQL with {count} {label}")
     print(f"📄 Saved to: {output_path}")
 
+def process_csv_to_diff(csv_path: str, output_path: str, snapshot_path: str,
+                        league: Optional[str] = 'Premier League', chunk_size: int = 50000,
+                        limit: Optional[int] = None, batch_size: int = 5000):
+    """Convert EA FC 25 CSV to UPSERT/DELETE statements against the last snapshot"""
+    
+    # Same ordering and cut as the full load, so repeated names resolve the same way
+    players = sort_players(iter_players(csv_path, league), chunk_size=chunk_size, limit=limit)
+    label = f"{league} players" if league else "players"
+    upserted, deleted, unchanged = write_diff_sql(players, output_path, snapshot_path,
+                                                  f"EA FC 25 {label.upper()} (INCREMENTAL)", batch_size=batch_size)
+    
+    print(f"✅ Generated diff for {label}: {upserted} upserted, {deleted} deleted, {unchanged} unchanged")
+    print(f"📄 Saved to: {output_path}")
+    print(f"🗂  Pending snapshot: {pending_snapshot_path(snapshot_path)}")
+    print(f"   After applying the SQL, run with --snapshot {snapshot_path} --commit-snapshot")
+
 def generate_sample_data():
     """Generate sample data if no CSV available"""
     print("Generating sample EA FC 25 style data...")
@@ -174,16 +408,56 @@ def generate_sample_data():
     print(f"✅ Generated sample SQL with {len(players)} players")
     print(f"📄 Saved to: {output_path}")
 
+def positive_int(value: str) -> int:
+    """argparse type for sizes that must be at least 1"""
+    number = int(value)
+    if number <= 0:
+        raise ValueError(value)
+    return number
+
 if __name__ == "__main__":
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Generate the players seed SQL from EA FC 25 data")
+    parser.add_argument("--csv", action="store_true", help="convert a SoFIFA CSV instead of the built-in sample")
+    parser.add_argument("--input", default=str(Path(__file__).parent / "player-data.csv"), help="SoFIFA CSV path")
+    parser.add_argument("--output", default=str(Path(__file__).parent / "seed-eafc25-premier-league.sql"))
+    parser.add_argument("--league", default="Premier League", help="league name filter")
+    parser.add_argument("--all-leagues", action="store_true", help="ingest every league")
+    parser.add_argument("--chunk-size", type=positive_int, default=50000, help="rows sorted in memory per run")
+    parser.add_argument("--limit", type=int, help="keep only the top N players by rating")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="sql",
+                        help="multi-row INSERTs (sql) or COPY FROM STDIN blocks (copy/csv)")
+    parser.add_argument("--batch-size", type=positive_int, default=5000, help="rows per INSERT/COPY statement")
+    parser.add_argument("--snapshot", help="emit only UPSERT/DELETE changes against this snapshot file, then update it")
+    parser.add_argument("--commit-snapshot", action="store_true",
+                        help="promote the pending snapshot after its SQL has been applied")
+    args = parser.parse_args()
+    if args.snapshot and args.format != "sql":
+        parser.error("--snapshot only supports --format sql")
+    if args.commit_snapshot:
+        if not args.snapshot:
+            parser.error("--commit-snapshot needs --snapshot")
+        if not promote_snapshot(args.snapshot):
+            print(f"❌ No pending snapshot for {args.snapshot}")
+            sys.exit(1)
+        print(f"🗂  Snapshot updated: {args.snapshot}")
+        sys.exit(0)
     
-    if len(sys.argv) > 1 and sys.argv[1] == "--csv":
-        csv_path = Path(__file__).parent / "player-data.csv"
+    if args.csv:
+        csv_path = Path(args.input)
         if csv_path.exists():
-            output_path = Path(__file__).parent / "seed-eafc25-premier-league.sql"
-            process_csv_to_sql(str(csv_path), str(output_path))
+            league = None if args.all_leagues else args.league
+            if args.snapshot:
+                process_csv_to_diff(str(csv_path), args.output, args.snapshot, league=league,
+                                    chunk_size=args.chunk_size, limit=args.limit,
+                                    batch_size=args.batch_size)
+            else:
+                process_csv_to_sql(str(csv_path), args.output, league=league,
+                                   chunk_size=args.chunk_size, limit=args.limit,
+                                   fmt=args.format, batch_size=args.batch_size)
         else:
-            print("❌ player-data.csv not found")
+            print(f"❌ {csv_path.name} not found")
             print("\nTo get full EA FC 25 data:")
             print("1. Go to: https://www.kaggle.com/datasets/aniss7/fifa-player-data-from-sofifa-2025-06-03")
             print("2. Download: player-data-full-2025-june.csv")
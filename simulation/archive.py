@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Moltball Result Archive
+
+Append-only columnar storage for finished matches. Every column is a flat
+binary file of fixed-width values (one per match, or one per event for the
+separate event table), and team/player/season names are stored once as
+categorical codes in meta.json. Reads are NumPy memmaps over those files,
+so analytics over many seasons of history cost almost no RAM.
+
+Event descriptions are not archived; they are presentation text and are
+left empty on results read back from the archive.
+"""
+
+import json
+import os
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from .engine import MatchEvent, MatchResult, MatchSummary
+from .players import _Categories
+
+ARCHIVE_VERSION = 2
+
+# Column name -> array typecode (the same codes are valid NumPy dtypes)
+MATCH_COLUMNS = {
+    "season": "I",
+    "fixture": "I",
+    "home_team": "H",
+    "away_team": "H",
+    "home_score": "B",
+    "away_score": "B",
+    "home_xg": "f",
+    "away_xg": "f",
+    "home_possession": "f",
+    "home_shots": "B",
+    "away_shots": "B",
+    "home_sot": "B",
+    "away_sot": "B",
+}
+
+EVENT_COLUMNS = {
+    "match": "I",
+    "minute": "B",
+    "type": "B",
+    "side": "B",  # 0 home, 1 away
+    "player": "I",
+}
+
+TABLES = {"matches": MATCH_COLUMNS, "events": EVENT_COLUMNS}
+CATEGORY_COLUMNS = ("season", "team", "player", "event_type")
+
+SIDES = ("home", "away")
+NO_PLAYER = 0xFFFFFFFF
+
+
+class ResultArchive:
+    """
+    Columnar on-disk store of match results, one directory per archive.
+
+    Appends are buffered in memory and written to the column files every
+    buffer_size matches (and on flush/close). meta.json is replaced
+    atomically after the columns are written and holds the committed row
+    counts, so a crash mid-write loses at most the unflushed buffer; any
+    trailing partial rows are truncated the next time the archive is opened.
+    """
+
+    def __init__(self, path: Union[str, Path], buffer_size: int = 1000):
+        self.path = Path(path)
+        self.buffer_size = buffer_size
+        self.categories: Dict[str, _Categories] = {column: _Categories() for column in CATEGORY_COLUMNS}
+        self.counts = {table: 0 for table in TABLES}
+        self._pending = {table: {column: array(code) for column, code in columns.items()}
+                         for table, columns in TABLES.items()}
+        self._pending_matches = 0
+
+        (self.path / "matches").mkdir(parents=True, exist_ok=True)
+        (self.path / "events").mkdir(exist_ok=True)
+        if (self.path / "meta.json").exists():
+            self._load_meta()
+        self._truncate_partial_rows()
+
+    def __enter__(self) -> "ResultArchive":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.counts["matches"] + self._pending_matches
+
+    @property
+    def event_count(self) -> int:
+        return self.counts["events"] + len(self._pending["events"]["match"])
+
+    # --- Writing ------------------------------------------------------------
+
+    def append(self, result: Union[MatchResult, MatchSummary], season: str = "", fixture: int = 0) -> int:
+        """Buffer one result and return its match index"""
+        index = len(self)
+        teams = self.categories["team"]
+        home, away = teams.encode(result.home_team), teams.encode(result.away_team)
+
+        row = self._pending["matches"]
+        row["season"].append(self.categories["season"].encode(season))
+        row["fixture"].append(fixture)
+        row["home_team"].append(home)
+        row["away_team"].append(away)
+        row["home_score"].append(result.home_score)
+        row["away_score"].append(result.away_score)
+        row["home_xg"].append(result.home_xg)
+        row["away_xg"].append(result.away_xg)
+        row["home_possession"].append(result.possession[0])
+        row["home_shots"].append(result.shots[0])
+        row["away_shots"].append(result.shots[1])
+        row["home_sot"].append(result.shots_on_target[0])
+        row["away_sot"].append(result.shots_on_target[1])
+        self._pending_matches += 1
+
+        events = self._pending["events"]
+        for event in getattr(result, "events", ()):
+            events["match"].append(index)
+            events["minute"].append(event.minute)
+            events["type"].append(self.categories["event_type"].encode(event.type))
+            events["side"].append(SIDES.index(event.team))
+            events["player"].append(NO_PLAYER if event.player is None
+                                    else self.categories["player"].encode(event.player))
+
+        if self._pending_matches >= self.buffer_size:
+            self.flush()
+        return index
+
+    def flush(self):
+        """Write buffered rows to the column files and commit the new counts"""
+        if not self._pending_matches:
+            return
+        for table, columns in self._pending.items():
+            for column, values in columns.items():
+                with open(self._column_path(table, column), "ab") as f:
+                    values.tofile(f)
+            self.counts[table] += len(next(iter(columns.values())))
+        self._save_meta()
+        self._pending = {table: {column: array(code) for column, code in columns.items()}
+                         for table, columns in TABLES.items()}
+        self._pending_matches = 0
+
+    def close(self):
+        self.flush()
+
+    def truncate(self, count: int):
+        """Drop every match from index count on, with its events"""
+        self.flush()
+        if count >= self.counts["matches"]:
+            return
+        match = self.column("events", "match")
+        events = int(np.searchsorted(match, count, "left"))
+        del match
+        for table, rows in (("matches", count), ("events", events)):
+            for column, code in TABLES[table].items():
+                os.truncate(self._column_path(table, column), rows * array(code).itemsize)
+            self.counts[table] = rows
+        self._save_meta()
+
+    def _column_path(self, table: str, column: str) -> Path:
+        return self.path / table / f"{column}.bin"
+
+    def _save_meta(self):
+        meta = {
+            "version": ARCHIVE_VERSION,
+            "counts": self.counts,
+            "categories": {column: cats.names for column, cats in self.categories.items()},
+        }
+        tmp_path = self.path / "meta.json.tmp"
+        tmp_path.write_text(json.dumps(meta, ensure_ascii=False))
+        os.replace(tmp_path, self.path / "meta.json")
+
+    def _load_meta(self):
+        meta = json.loads((self.path / "meta.json").read_text())
+        if meta.get("version") != ARCHIVE_VERSION:
+            raise ValueError(f"unsupported archive version {meta.get('version')!r} in {self.path}")
+        self.counts = {table: meta["counts"].get(table, 0) for table in TABLES}
+        for column, names in meta["categories"].items():
+            for name in names:
+                self.categories[column].encode(name)
+
+    def _truncate_partial_rows(self):
+        """Drop bytes written past the committed counts by an interrupted flush"""
+        for table, columns in TABLES.items():
+            for column, code in columns.items():
+                path = self._column_path(table, column)
+                size = self.counts[table] * array(code).itemsize
+                if not path.exists():
+                    path.touch()
+                elif path.stat().st_size > size:
+                    os.truncate(path, size)
+
+    # --- Reading ------------------------------------------------------------
+
+    def column(self, table: str, column: str) -> np.ndarray:
+        """Read-only memmap of one committed column (flushes pending rows first)"""
+        self.flush()
+        code = TABLES[table][column]
+        count = self.counts[table]
+        if count == 0:
+            return np.empty(0, dtype=code)
+        return np.memmap(self._column_path(table, column), dtype=code, mode="r", shape=(count,))
+
+    def player_goals(self, team: Optional[str] = None) -> Dict[str, int]:
+        """Goals per player across the whole archive, optionally for one team"""
+        goal = self.categories["event_type"].codes.get("goal")
+        if goal is None:
+            return {}
+        mask = self.column("events", "type") == goal
+        if team is not None:
+            match, side = self.column("events", "match"), self.column("events", "side")
+            teams = np.where(side == 0, self.column("matches", "home_team")[match],
+                             self.column("matches", "away_team")[match])
+            mask &= teams == self.categories["team"].codes.get(team, -1)
+        players = self.column("events", "player")[mask]
+        players = players[players != NO_PLAYER]
+        counts = np.bincount(players, minlength=len(self.categories["player"].names))
+        names = self.categories["player"].names
+        return {names[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+
+    def team_goals(self) -> Dict[str, int]:
+        """Goals scored per team across the whole archive"""
+        size = len(self.categories["team"].names)
+        counts = (np.bincount(self.column("matches", "home_team"),
+                              weights=self.column("matches", "home_score"), minlength=size)
+                  + np.bincount(self.column("matches", "away_team"),
+                                weights=self.column("matches", "away_score"), minlength=size))
+        return {name: int(counts[i]) for i, name in enumerate(self.categories["team"].names)}
+
+    def result(self, index: int) -> MatchResult:
+        """Rebuild one archived match (event descriptions are not stored)"""
+        if not 0 <= index < len(self):
+            raise IndexError(f"match index {index} out of range")
+        columns = {name: self.column("matches", name)[index] for name in MATCH_COLUMNS}
+        teams = self.categories["team"].names
+        home_team, away_team = teams[columns["home_team"]], teams[columns["away_team"]]
+        home_possession = round(float(columns["home_possession"]), 1)
+
+        # Events are appended in match order, so each match's events are contiguous
+        match = self.column("events", "match")
+        lo, hi = np.searchsorted(match, index, "left"), np.searchsorted(match, index, "right")
+        players = self.categories["player"].names
+        types = self.categories["event_type"].names
+        events = [
+            MatchEvent(
+                minute=int(minute),
+                type=types[event_type],
+                team=SIDES[side],
+                player=None if player == NO_PLAYER else players[player],
+            )
+            for minute, event_type, side, player in zip(
+                self.column("events", "minute")[lo:hi], self.column("events", "type")[lo:hi],
+                self.column("events", "side")[lo:hi], self.column("events", "player")[lo:hi])
+        ]
+
+        return MatchResult(
+            home_team=home_team,
+            away_team=away_team,
+            home_score=int(columns["home_score"]),
+            away_score=int(columns["away_score"]),
+            home_xg=round(float(columns["home_xg"]), 2),
+            away_xg=round(float(columns["away_xg"]), 2),
+            events=events,
+            possession=(home_possession, round(100 - home_possession, 1)),
+            shots=(int(columns["home_shots"]), int(columns["away_shots"])),
+            shots_on_target=(int(columns["home_sot"]), int(columns["away_sot"]))
+        )
+
+    def results(self) -> Iterator[MatchResult]:
+        for index in range(len(self)):
+            yield self.result(index)
+
+    def seasons(self) -> List[str]:
+        return list(self.categories["season"].names)
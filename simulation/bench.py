@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Moltball Engine Benchmarks
+
+Measures throughput of the hot paths (single matches, full seasons, team
+construction, player seed generation) across squad and league sizes.
+Results can be saved as a JSON baseline and later runs compared against it,
+exiting non-zero when any case regresses beyond the tolerance.
+
+Usage: python -m simulation.bench [--quick] [--save [FILE]] [--baseline [FILE]]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .engine import (LeagueSimulator, MatchSimulator, Tactics, TeamState, create_sample_team,
+                     _solve_lineup, _squad_fit_scores)
+
+DEFAULT_BASELINE = Path(__file__).parent / "bench-baseline.json"
+SEED_SCRIPT = Path(__file__).parent.parent / "scripts" / "fetch-eafc25-players.py"
+
+SQUAD_SIZES = (18, 30, 40)
+LEAGUE_SIZES = (6, 20)
+
+
+def sample_squad(name: str, overall: int, size: int, rng: random.Random) -> TeamState:
+    """A sample team padded (or trimmed) to size players"""
+    players = []
+    while len(players) < size:
+        players.extend(create_sample_team(f"{name} {len(players)}", overall, rng=rng).players)
+    for i, p in enumerate(players):
+        p.player_name = f"{name} #{i}"
+        p.club = name
+    return TeamState(name=name, players=players[:size], tactics=Tactics())
+
+
+def measure(fn: Callable[[], int], min_time: float, repeat: int) -> float:
+    """Best-of-repeat throughput in ops/sec; fn returns the ops it performed"""
+    best = 0.0
+    for _ in range(repeat):
+        ops = 0
+        start = time.perf_counter()
+        elapsed = 0.0
+        while elapsed < min_time:
+            ops += fn()
+            elapsed = time.perf_counter() - start
+        best = max(best, ops / elapsed)
+    return best
+
+
+def _bench_match(squad_size: int, detail_level: str = "full") -> Callable[[], int]:
+    rng = random.Random(squad_size)
+    home = sample_squad("Home", 80, squad_size, rng)
+    away = sample_squad("Away", 78, squad_size, rng)
+
+    def run() -> int:
+        MatchSimulator(home, away, rng=rng).simulate(detail_level=detail_level)
+        return 1
+    return run
+
+
+def _bench_team_construction(squad_size: int, cold: bool) -> Callable[[], int]:
+    rng = random.Random(squad_size)
+    squads = [sample_squad(f"T{i}", 75, squad_size, rng).players for i in range(20)]
+    formations = ["4-4-2", "4-3-3", "3-5-2", "5-3-2", "4-2-3-1", "4-5-1"]
+
+    def run() -> int:
+        for players in squads:
+            for formation in formations:
+                if cold:
+                    _solve_lineup.cache_clear()
+                    _squad_fit_scores.cache_clear()
+                TeamState(name="T", players=players, tactics=Tactics(formation))
+        return len(squads) * len(formations)
+    return run
+
+
+def _bench_season(league_size: int) -> Callable[[], int]:
+    rng = random.Random(league_size)
+    teams = [sample_squad(f"Team {i}", 72 + i % 12, 18, rng) for i in range(league_size)]
+    seeds = iter(range(10 ** 9))
+
+    def run() -> int:
+        league = LeagueSimulator(teams, seed=next(seeds))
+        while league.matchdays:
+            league.simulate_matchday()
+        return 1
+    return run
+
+
+def _load_seed_script():
+    spec = importlib.util.spec_from_file_location("fetch_eafc25_players", SEED_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _bench_seed_generation(rows: int, fmt: str) -> Callable[[], int]:
+    seeder = _load_seed_script()
+    rng = random.Random(rows)
+    csv_rows = [{
+        'name': f"Player {i}",
+        'club_name': rng.choice(["Arsenal", "Chelsea", "Nott'm Forest", "Real Madrid"]),
+        'club_position': rng.choice(["GK", "CB", "LB", "CM", "CAM", "ST", "LW", "SUB"]),
+        'overall_rating': str(rng.randint(50, 93)),
+        'pace': str(rng.randint(40, 95)),
+        'shooting': str(rng.randint(30, 95)),
+        'passing': str(rng.randint(40, 95)),
+        'dribbling': str(rng.randint(40, 95)),
+        'defending': str(rng.randint(20, 90)),
+        'physicality': str(rng.randint(40, 90)),
+    } for i in range(rows)]
+
+    def run() -> int:
+        players = seeder.sort_players((seeder.parse_player(r) for r in csv_rows), chunk_size=rows // 4)
+        return seeder.write_sql(players, os.devnull, "BENCHMARK", fmt=fmt)
+    return run
+
+
+def benchmark_cases(quick: bool = False) -> Dict[str, Callable[[], int]]:
+    squad_sizes = SQUAD_SIZES[:1] if quick else SQUAD_SIZES
+    league_sizes = LEAGUE_SIZES[:1] if quick else LEAGUE_SIZES
+    seed_rows = 2000 if quick else 20000
+
+    cases: Dict[str, Callable[[], int]] = {}
+    for size in squad_sizes:
+        cases[f"match.simulate[squad={size}]"] = _bench_match(size)
+        cases[f"match.simulate.summary[squad={size}]"] = _bench_match(size, "summary")
+    for size in squad_sizes:
+        cases[f"team.construct.cold[squad={size}]"] = _bench_team_construction(size, cold=True)
+        cases[f"team.construct.warm[squad={size}]"] = _bench_team_construction(size, cold=False)
+    for size in league_sizes:
+        cases[f"league.season[teams={size}]"] = _bench_season(size)
+    for fmt in ("sql", "copy"):
+        cases[f"seed.generate[rows={seed_rows},format={fmt}]"] = _bench_seed_generation(seed_rows, fmt)
+    return cases
+
+
+def run_benchmarks(quick: bool = False, min_time: float = 0.5, repeat: int = 3,
+                   only: Optional[str] = None) -> dict:
+    results = {}
+    for name, fn in benchmark_cases(quick).items():
+        if only and only not in name:
+            continue
+        results[name] = round(measure(fn, min_time, repeat), 2)
+        print(f"{name:<48} {results[name]:>14,.1f} ops/s")
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Names of cases slower than baseline by more than tolerance"""
+    regressions = []
+    for name, ops in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        change = ops / base - 1
+        marker = ""
+        if change < -tolerance:
+            regressions.append(name)
+            marker = "  <-- REGRESSION"
+        print(f"{name:<48} {base:>14,.1f} -> {ops:>14,.1f} ({change:+.1%}){marker}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Moltball simulation engine")
+    parser.add_argument("--quick", action="store_true", help="smallest sizes only")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds per measurement")
+    parser.add_argument("--repeat", type=int, default=3, help="measurements per case (best is kept)")
+    parser.add_argument("--only", help="run cases whose name contains this")
+    parser.add_argument("--save", nargs="?", const=str(DEFAULT_BASELINE), help="write results as the new baseline")
+    parser.add_argument("--baseline", nargs="?", const=str(DEFAULT_BASELINE), help="compare against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before failing")
+    args = parser.parse_args(argv)
+
+    # Timings are machine-specific, so no baseline ships with the repo
+    if args.baseline and not Path(args.baseline).exists():
+        print(f"❌ No baseline at {args.baseline} — run with --save first")
+        return 2
+
+    current = run_benchmarks(args.quick, args.min_time, args.repeat, args.only)
+
+    status = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        print(f"\nCompared to {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s)")
+            status = 1
+        else:
+            print("\n✅ No regressions")
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(current, indent=2) + "\n")
+        print(f"📄 Saved baseline to: {args.save}")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Moltball Forecast Cache
+
+Content-addressed store of sampled fixture outcome distributions (exact
+ones are cheaper to compute than to look up, so they bypass it). The key is
+everything the engine reads from both teams (name, lineup positions,
+ratings, every PlayerStats field, live form and the Tactics) plus the
+sample count and seed, so editing a player or a tactic simply produces a
+new key and stale entries are never served; they age out of the LRU.
+
+Entries live in a bounded in-memory LRU keyed by that content itself,
+optionally backed by a sqlite file, keyed by a digest of it, shared
+between processes and restarts. Disk writes are committed in batches.
+"""
+
+import hashlib
+import json
+import sqlite3
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Union
+
+import numpy as np
+
+from .batch import BatchMatchSimulator
+from .engine import MatchSimulator, OutcomeDistribution, PlayerStats, TeamState, outcome_distribution
+
+# Bump when the engine's model changes so old on-disk entries stop matching
+CACHE_VERSION = 1
+
+# Read by name so PlayerTable rows (which have __slots__) work too
+_PLAYER_FIELDS = tuple(PlayerStats.__dataclass_fields__)
+
+
+def _team_fingerprint(team: TeamState) -> tuple:
+    tactics = team.tactics
+    return (
+        team.name,
+        tuple(team.formation_positions),
+        (team.attack_rating, team.defense_rating, team.midfield_rating),
+        (tactics.formation, tactics.attacking_intensity, tactics.defensive_line,
+         tactics.pressing_intensity, tactics.play_style.name),
+        tuple(tuple(getattr(p, f) for f in _PLAYER_FIELDS) for p in team.players),
+        team.form,
+    )
+
+
+def fixture_key(home: TeamState, away: TeamState, samples: Optional[int] = None,
+                seed: Optional[int] = None) -> Hashable:
+    """Everything a fixture forecast depends on; exact forecasts have samples=None"""
+    return CACHE_VERSION, _team_fingerprint(home), _team_fingerprint(away), samples, seed
+
+
+def stable_key(key: Hashable) -> str:
+    """Digest of a fixture_key that is the same in every process"""
+    return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def sampled_distribution(home: TeamState, away: TeamState, samples: int,
+                         seed: Optional[int] = None) -> OutcomeDistribution:
+    """Empirical outcome distribution from samples batch-engine replays"""
+    if samples <= 0:
+        raise ValueError(f"samples must be positive, got {samples}")
+    result = BatchMatchSimulator(seed).simulate(home, away, samples)
+    home_win, draw, away_win = result.outcome_probabilities()
+    size = MatchSimulator.CHANCES_PER_MATCH + 1
+    return OutcomeDistribution(
+        home_team=home.name,
+        away_team=away.name,
+        home_win=float(home_win),
+        draw=float(draw),
+        away_win=float(away_win),
+        home_goals=(np.bincount(result.home_score, minlength=size) / samples).tolist(),
+        away_goals=(np.bincount(result.away_score, minlength=size) / samples).tolist(),
+        home_xg=float(result.home_xg.mean()),
+        away_xg=float(result.away_xg.mean())
+    )
+
+
+class ForecastCache:
+    """
+    Two-tier cache of fixture outcome distributions.
+
+    maxsize bounds the in-memory LRU; path, if given, is a sqlite database
+    that keeps every entry (disk hits are promoted into memory). New disk
+    entries are committed every write_batch puts and on flush()/close().
+    Exact and unseeded sampled forecasts are computed but never cached.
+    """
+
+    def __init__(self, maxsize: int = 1024, path: Optional[Union[str, Path]] = None,
+                 write_batch: int = 64):
+        self.maxsize = maxsize
+        self.write_batch = write_batch
+        self._memory: "OrderedDict[Hashable, OutcomeDistribution]" = OrderedDict()
+        self._unwritten: Dict[str, str] = {}  # Digest -> JSON awaiting a disk commit
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(str(path))
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS forecasts (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._db.commit()
+
+    def __enter__(self) -> "ForecastCache":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def close(self):
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    def forecast(self, home: TeamState, away: TeamState, samples: Optional[int] = None,
+                 seed: Optional[int] = None) -> OutcomeDistribution:
+        """Outcome distribution for a fixture: exact, or from samples seeded replays"""
+        if samples is None:
+            return outcome_distribution(home, away)
+        if seed is None:
+            self.misses += 1
+            return sampled_distribution(home, away, samples)
+
+        key = fixture_key(home, away, samples, seed)
+        dist = self.get(key)
+        if dist is None:
+            self.misses += 1
+            dist = sampled_distribution(home, away, samples, seed)
+            self.put(key, dist)
+        return dist
+
+    def get(self, key: Hashable) -> Optional[OutcomeDistribution]:
+        dist = self._memory.get(key)
+        if dist is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return dist
+        if self._db is None:
+            return None
+        digest = stable_key(key)
+        value = self._unwritten.get(digest)
+        if value is None:
+            row = self._db.execute("SELECT value FROM forecasts WHERE key = ?", (digest,)).fetchone()
+            if row is None:
+                return None
+            value = row[0]
+        dist = OutcomeDistribution(**json.loads(value))
+        self._remember(key, dist)
+        self.disk_hits += 1
+        return dist
+
+    def put(self, key: Hashable, dist: OutcomeDistribution):
+        self._remember(key, dist)
+        if self._db is not None:
+            self._unwritten[stable_key(key)] = json.dumps(asdict(dist))
+            if len(self._unwritten) >= self.write_batch:
+                self.flush()
+
+    def flush(self):
+        """Commit pending disk entries"""
+        if self._db is not None and self._unwritten:
+            self._db.executemany("INSERT OR REPLACE INTO forecasts (key, value) VALUES (?, ?)",
+                                 self._unwritten.items())
+            self._db.commit()
+            self._unwritten = {}
+
+    def clear(self):
+        """Empty both tiers"""
+        self._memory.clear()
+        self._unwritten = {}
+        if self._db is not None:
+            self._db.execute("DELETE FROM forecasts")
+            self._db.commit()
+
+    def _remember(self, key: Hashable, dist: OutcomeDistribution):
+        self._memory[key] = dist
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
@@ -6,12 +6,56 @@ Simulates soccer matches based on player stats, tactics, and form.
 Similar to Database Ball's baseball simulation but for soccer.
 """
 
+import copy
 import random
 import json
+import os
+import pickle
+import struct
+import time
+import zlib
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, Deque, Iterator, List, Dict, NamedTuple, Tuple, Optional, Sequence, Union
 from enum import Enum
 import math
+from bisect import bisect_left, insort
+from concurrent.futures import Executor
+from collections import deque
+from functools import lru_cache, wraps
+from itertools import accumulate
+
+
+# Positions eligible to take a chance / that count towards defending one
+SHOOTER_POSITIONS = ["ST", "LW", "RW", "CAM", "CM"]
+DEFENSIVE_POSITIONS = ["CB", "GK", "LB", "RB"]
+ON_TARGET_MISS_RATE = 0.3
+
+FORMATIONS = {
+    "4-4-2": ["GK", "LB", "CB", "CB", "RB", "LM", "CM", "CM", "RM", "ST", "ST"],
+    "4-3-3": ["GK", "LB", "CB", "CB", "RB", "CDM", "CM", "CM", "LW", "ST", "RW"],
+    "3-5-2": ["GK", "CB", "CB", "CB", "LWB", "CDM", "CM", "CM", "RWB", "ST", "ST"],
+    "5-3-2": ["GK", "LWB", "CB", "CB", "CB", "RWB", "CM", "CM", "CM", "ST", "ST"],
+    "4-2-3-1": ["GK", "LB", "CB", "CB", "RB", "CDM", "CDM", "CAM", "LW", "RW", "ST"],
+    "4-5-1": ["GK", "LB", "CB", "CB", "RB", "LM", "CM", "CM", "CM", "RM", "ST"]
+}
+
+NEARBY_POSITIONS = {
+    "GK": ["GK"],
+    "LB": ["LB", "LWB", "LM"],
+    "CB": ["CB"],
+    "RB": ["RB", "RWB", "RM"],
+    "CDM": ["CDM", "CM"],
+    "CM": ["CM", "CDM", "CAM"],
+    "CAM": ["CAM", "CM"],
+    "LM": ["LM", "LW", "LB"],
+    "RM": ["RM", "RW", "RB"],
+    "LW": ["LW", "LM"],
+    "RW": ["RW", "RM"],
+    "ST": ["ST", "CAM"]
+}
+
+SLOT_POSITIONS = sorted({pos for positions in FORMATIONS.values() for pos in positions})
 
 
 class PlayStyle(Enum):
@@ -49,6 +93,59 @@ class Tactics:
     play_style: PlayStyle = PlayStyle.BALANCED
 
 
+@dataclass(frozen=True)
+class SimProfile:
+    """
+    Everything the match engine reads from a team on each chance, built once.
+    
+    Shooter selection uses cumulative weights (as random.choices would build
+    them) and the defensive factors multiply the xG of chances conceded.
+    """
+    shooters: Tuple[PlayerStats, ...]
+    weights: Tuple[float, ...]
+    cum_weights: Tuple[float, ...]
+    base_xg: Tuple[float, ...]  # shooting / 100 per shooter
+    defense_factor: float  # 1 - avg_defense / 300
+    gk_factor: float  # 1 - gk.overall / 300, 1.0 without a keeper
+    
+    @classmethod
+    def build(cls, players: List[PlayerStats],
+              form: Optional[Sequence[Tuple[float, float]]] = None) -> "SimProfile":
+        """form, if given, holds (goals, minutes) per player to use instead of the season totals"""
+        if form is None or len(form) != len(players):
+            form = [(p.goals, p.minutes) for p in players]
+        shooting = [i for i, p in enumerate(players) if p.position in SHOOTER_POSITIONS]
+        if not shooting:
+            shooting = range(len(players))
+        shooters = [players[i] for i in shooting]
+        
+        # Weight by shooting and goals/minutes ratio (form)
+        weights = [players[i].shooting * (1 + form[i][0] / max(form[i][1] / 90, 1)) for i in shooting]
+        
+        defenders = [p for p in players if p.position in DEFENSIVE_POSITIONS]
+        avg_defense = sum(p.defense for p in defenders) / len(defenders) if defenders else 50
+        gk = next((p for p in players if p.position == "GK"), None)
+        
+        return cls(
+            shooters=tuple(shooters),
+            weights=tuple(weights),
+            cum_weights=tuple(accumulate(weights)),
+            base_xg=tuple(p.shooting / 100 for p in shooters),
+            defense_factor=1 - avg_defense / 300,
+            gk_factor=1 - gk.overall / 300 if gk else 1.0
+        )
+    
+    def chance_xgs(self, defending: "SimProfile") -> List[float]:
+        """xG of a chance by each shooter against the defending profile"""
+        return [max(0.05, min(0.95, xg * defending.defense_factor * defending.gk_factor))  # Clamp between 5% and 95%
+                for xg in self.base_xg]
+    
+    def conversion_probability(self, defending: "SimProfile") -> float:
+        """Probability that a chance is scored, averaged over shooter selection"""
+        total = self.cum_weights[-1]
+        return sum(w * xg for w, xg in zip(self.weights, self.chance_xgs(defending))) / total
+
+
 @dataclass
 class TeamState:
     name: str
@@ -61,23 +158,49 @@ class TeamState:
     defense_rating: float = 0.0
     midfield_rating: float = 0.0
     
+    # Live (goals, minutes) per player, kept up to date by form.FormTracker
+    form: Optional[Tuple[Tuple[float, float], ...]] = field(default=None, repr=False, compare=False)
+    
+    _sim_profile: Optional[SimProfile] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         if not self.formation_positions:
             self.formation_positions = self._get_formation_positions()
         self._calculate_ratings()
     
+    @classmethod
+    def from_table(cls, name: str, table, indices: Sequence[int],
+                   tactics: Optional[Tactics] = None) -> "TeamState":
+        """Build a team from row indices into a PlayerTable (see simulation/players.py)"""
+        return cls(name=name, players=table.rows(indices), tactics=tactics if tactics is not None else Tactics())
+    
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ("players", "tactics", "form"):
+            super().__setattr__("_sim_profile", None)
+    
+    @property
+    def sim_profile(self) -> SimProfile:
+        """Cached engine profile; rebuilt after players, tactics or form are replaced"""
+        if self._sim_profile is None:
+            self._sim_profile = SimProfile.build(self.players, self.form)
+        return self._sim_profile
+    
+    def invalidate_profile(self):
+        """Drop the cached profile after mutating players in place"""
+        self._sim_profile = None
+    
     def _get_formation_positions(self) -> List[str]:
-        formations = {
-            "4-4-2": ["GK", "LB", "CB", "CB", "RB", "LM", "CM", "CM", "RM", "ST", "ST"],
-            "4-3-3": ["GK", "LB", "CB", "CB", "RB", "CDM", "CM", "CM", "LW", "ST", "RW"],
-            "3-5-2": ["GK", "CB", "CB", "CB", "LWB", "CDM", "CM", "CM", "RWB", "ST", "ST"],
-            "5-3-2": ["GK", "LWB", "CB", "CB", "CB", "RWB", "CM", "CM", "CM", "ST", "ST"],
-            "4-2-3-1": ["GK", "LB", "CB", "CB", "RB", "CDM", "CDM", "CAM", "LW", "RW", "ST"],
-            "4-5-1": ["GK", "LB", "CB", "CB", "RB", "LM", "CM", "CM", "CM", "RM", "ST"]
-        }
-        return formations.get(self.tactics.formation, formations["4-4-2"])
+        return list(FORMATIONS.get(self.tactics.formation, FORMATIONS["4-4-2"]))
     
     def _calculate_ratings(self):
+        self.attack_rating, self.defense_rating, self.midfield_rating = self._lineup_ratings()
+        
+        # Apply tactical modifiers
+        self._apply_tactical_modifiers()
+    
+    def _lineup_ratings(self) -> Tuple[float, float, float]:
+        """Attack, defense and midfield ratings of the best lineup, before tactics"""
         # Map players to positions (best fit)
         lineup = self._select_lineup()
         
@@ -86,57 +209,20 @@ class TeamState:
         defenders = [p for p in lineup if p.position in ["CB", "LB", "RB", "GK"]]
         midfielders = [p for p in lineup if p.position in ["CM", "CDM", "LM", "RM"]]
         
-        self.attack_rating = self._calculate_position_rating(attackers, ["shooting", "pace", "dribbling"])
-        self.defense_rating = self._calculate_position_rating(defenders, ["defense", "physical"])
-        self.midfield_rating = self._calculate_position_rating(midfielders, ["passing", "physical", "defense"])
-        
-        # Apply tactical modifiers
-        self._apply_tactical_modifiers()
+        return (
+            self._calculate_position_rating(attackers, ["shooting", "pace", "dribbling"]),
+            self._calculate_position_rating(defenders, ["defense", "physical"]),
+            self._calculate_position_rating(midfielders, ["passing", "physical", "defense"])
+        )
     
     def _select_lineup(self) -> List[PlayerStats]:
-        """Select best player for each position"""
-        selected = []
-        available = self.players.copy()
-        
-        for position in self.formation_positions:
-            # Find best player for this position
-            best = None
-            best_score = -1
-            
-            for player in available:
-                score = self._position_fit_score(player, position)
-                if score > best_score:
-                    best_score = score
-                    best = player
-            
-            if best:
-                selected.append(best)
-                available.remove(best)
-        
-        return selected
+        """Select the lineup maximising total position fit"""
+        squad_key = tuple((p.position, p.overall) for p in self.players)
+        return [self.players[i] for i in _solve_lineup(squad_key, tuple(self.formation_positions))]
     
     def _position_fit_score(self, player: PlayerStats, position: str) -> float:
         """Calculate how well a player fits a position"""
-        position_bonus = 20 if player.position == position else 0
-        nearby_positions = {
-            "GK": ["GK"],
-            "LB": ["LB", "LWB", "LM"],
-            "CB": ["CB"],
-            "RB": ["RB", "RWB", "RM"],
-            "CDM": ["CDM", "CM"],
-            "CM": ["CM", "CDM", "CAM"],
-            "CAM": ["CAM", "CM"],
-            "LM": ["LM", "LW", "LB"],
-            "RM": ["RM", "RW", "RB"],
-            "LW": ["LW", "LM"],
-            "RW": ["RW", "RM"],
-            "ST": ["ST", "CAM"]
-        }
-        
-        if position in nearby_positions.get(player.position, []):
-            position_bonus = 10
-        
-        return player.overall + position_bonus
+        return _position_fit(player.position, player.overall, position)
     
     def _calculate_position_rating(self, players: List[PlayerStats], key_stats: List[str]) -> float:
         if not players:
@@ -176,6 +262,100 @@ class TeamState:
         self.midfield_rating *= mid_mod
 
 
+def _position_fit(player_position: str, overall: int, position: str) -> float:
+    position_bonus = 20 if player_position == position else 0
+    if position in NEARBY_POSITIONS.get(player_position, []):
+        position_bonus = 10
+    
+    return overall + position_bonus
+
+
+@lru_cache(maxsize=1024)
+def _squad_fit_scores(squad_key: Tuple[Tuple[str, int], ...]) -> Dict[str, Tuple[float, ...]]:
+    """Fit of every squad member for every slot used by any formation"""
+    return {
+        slot: tuple(_position_fit(pos, overall, slot) for pos, overall in squad_key)
+        for slot in SLOT_POSITIONS
+    }
+
+
+@lru_cache(maxsize=4096)
+def _solve_lineup(squad_key: Tuple[Tuple[str, int], ...], positions: Tuple[str, ...]) -> Tuple[int, ...]:
+    """
+    Squad indices for each formation slot (in slot order) maximising total fit.
+    
+    Cached on (squad fingerprint, formation); with fewer players than slots
+    every player is placed and the remaining slots stay empty.
+    """
+    if not squad_key or not positions:
+        return ()
+    
+    fits = _squad_fit_scores(squad_key)
+    scores = [fits[slot] if slot in fits else tuple(_position_fit(pos, overall, slot) for pos, overall in squad_key)
+              for slot in positions]
+    
+    if len(positions) <= len(squad_key):
+        player_for_slot = _hungarian([[-score for score in row] for row in scores])
+        return tuple(player_for_slot)
+    
+    # More slots than players: assign players to slots instead
+    slot_for_player = _hungarian([[-scores[slot][i] for slot in range(len(positions))]
+                                  for i in range(len(squad_key))])
+    player_at = {slot: i for i, slot in enumerate(slot_for_player)}
+    return tuple(player_at[slot] for slot in range(len(positions)) if slot in player_at)
+
+
+def _hungarian(cost: List[List[float]]) -> List[int]:
+    """Minimum-cost assignment of each row to a distinct column (rows <= columns)"""
+    n, m = len(cost), len(cost[0])
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    row_of = [0] * (m + 1)  # 1-based row assigned to column j, 0 = free
+    way = [0] * (m + 1)
+    
+    for i in range(1, n + 1):
+        row_of[0] = i
+        j0 = 0
+        min_v = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = row_of[j0]
+            row = cost[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u[i0] - v[j]
+                    if cur < min_v[j]:
+                        min_v[j] = cur
+                        way[j] = j0
+                    if min_v[j] < delta:
+                        delta = min_v[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[row_of[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_v[j] -= delta
+            j0 = j1
+            if row_of[j0] == 0:
+                break
+        # Augment along the alternating path
+        while j0:
+            j1 = way[j0]
+            row_of[j0] = row_of[j1]
+            j0 = j1
+    
+    assignment = [0] * n
+    for j in range(1, m + 1):
+        if row_of[j]:
+            assignment[row_of[j] - 1] = j - 1
+    return assignment
+
+
 @dataclass
 class MatchEvent:
     minute: int
@@ -199,6 +379,64 @@ class MatchResult:
     shots_on_target: Tuple[int, int]
 
 
+class MatchSummary(NamedTuple):
+    """Scores and stats only, returned by detail_level="summary" """
+    home_team: str
+    away_team: str
+    home_score: int
+    away_score: int
+    home_xg: float
+    away_xg: float
+    possession: Tuple[float, float]
+    shots: Tuple[int, int]
+    shots_on_target: Tuple[int, int]
+
+
+class MatchUpdate(NamedTuple):
+    """One period of simulate_stream: running totals plus the events of that period"""
+    minute: int
+    home_score: int
+    away_score: int
+    home_xg: float
+    away_xg: float
+    possession: Tuple[float, float]
+    shots: Tuple[int, int]
+    shots_on_target: Tuple[int, int]
+    events: List[MatchEvent]
+
+
+# "summary": no events at all, "goals": goal events without descriptions, "full": everything
+DETAIL_LEVELS = ("summary", "goals", "full")
+
+
+@dataclass
+class OutcomeDistribution:
+    home_team: str
+    away_team: str
+    home_win: float
+    draw: float
+    away_win: float
+    home_goals: List[float]  # P(home scores k), k = 0..CHANCES_PER_MATCH
+    away_goals: List[float]
+    home_xg: float  # Expected xG (equals expected goals under the engine's model)
+    away_xg: float
+    
+    @property
+    def scorelines(self) -> List[List[float]]:
+        """Matrix of P(home_score == i and away_score == j)"""
+        return [[h * a for a in self.away_goals] for h in self.home_goals]
+    
+    def scoreline(self, home_score: int, away_score: int) -> float:
+        if home_score >= len(self.home_goals) or away_score >= len(self.away_goals):
+            return 0.0
+        return self.home_goals[home_score] * self.away_goals[away_score]
+    
+    def most_likely_score(self) -> Tuple[int, int]:
+        home = max(range(len(self.home_goals)), key=self.home_goals.__getitem__)
+        away = max(range(len(self.away_goals)), key=self.away_goals.__getitem__)
+        return home, away
+
+
 class MatchSimulator:
     """
     Simulates a soccer match between two teams.
@@ -208,10 +446,16 @@ class MatchSimulator:
     """
     
     BASE_GOAL_PROBABILITY = 0.03  # ~2.7 goals per game average
+    PERIOD_MINUTES = tuple(range(5, 95, 5))
+    ATTEMPTS_PER_PERIOD = 3
+    CHANCES_PER_MATCH = len(PERIOD_MINUTES) * ATTEMPTS_PER_PERIOD
     
-    def __init__(self, home_team: TeamState, away_team: TeamState):
+    def __init__(self, home_team: TeamState, away_team: TeamState,
+                 rng: Optional[random.Random] = None):
         self.home = home_team
         self.away = away_team
+        # Defaults to the module-level generator; pass a seeded Random for reproducible runs
+        self.rng = rng if rng is not None else random
         self.events: List[MatchEvent] = []
         self.home_score = 0
         self.away_score = 0
@@ -221,30 +465,37 @@ class MatchSimulator:
         self.away_shots = 0
         self.home_sot = 0
         self.away_sot = 0
+        self.detail_level = "full"
     
-    def simulate(self, use_randomness: bool = True) -> MatchResult:
-        """Run the full 90-minute simulation"""
-        random.seed() if use_randomness else random.seed(42)
-        
-        # Calculate base chance creation rates
-        home_attack_strength = self.home.attack_rating + self.home.midfield_rating * 0.3
-        away_defense_strength = self.away.defense_rating + self.away.midfield_rating * 0.3
-        
-        away_attack_strength = self.away.attack_rating + self.away.midfield_rating * 0.3
-        home_defense_strength = self.home.defense_rating + self.home.midfield_rating * 0.3
+    def simulate(self, use_randomness: bool = True,
+                 detail_level: str = "full") -> Union[MatchResult, MatchSummary]:
+        """
+        Run the full 90-minute simulation.
         
-        # Home advantage
-        home_attack_strength *= 1.1
-        home_defense_strength *= 1.05
+        Lower detail levels skip building events (and their description
+        strings) but draw the same random numbers, so a match replayed at
+        "full" detail from the same RNG state has the same result.
+        """
+        home_chance_prob, away_chance_prob = self._start(use_randomness, detail_level)
         
         # Simulate in 5-minute chunks for efficiency
-        for minute in range(5, 95, 5):
-            self._simulate_period(minute, home_attack_strength, away_defense_strength,
-                                 away_attack_strength, home_defense_strength)
+        for minute in self.PERIOD_MINUTES:
+            self._simulate_period(minute, home_chance_prob, away_chance_prob)
         
-        # Calculate possession based on midfield
-        total_midfield = self.home.midfield_rating + self.away.midfield_rating
-        home_possession = (self.home.midfield_rating / total_midfield) * 100
+        home_possession = self._home_possession()
+        
+        if detail_level == "summary":
+            return MatchSummary(
+                self.home.name,
+                self.away.name,
+                self.home_score,
+                self.away_score,
+                round(self.home_xg, 2),
+                round(self.away_xg, 2),
+                (round(home_possession, 1), round(100 - home_possession, 1)),
+                (self.home_shots, self.away_shots),
+                (self.home_sot, self.away_sot)
+            )
         
         return MatchResult(
             home_team=self.home.name,
@@ -259,53 +510,102 @@ class MatchSimulator:
             shots_on_target=(self.home_sot, self.away_sot)
         )
     
-    def _simulate_period(self, minute: int, home_atk: float, away_def: float,
-                        away_atk: float, home_def: float):
-        """Simulate a 5-minute period"""
+    def simulate_stream(self, use_randomness: bool = True,
+                        detail_level: str = "full") -> Iterator[MatchUpdate]:
+        """
+        Play the match one period at a time for live feeds.
+        
+        Yields a MatchUpdate after every period and only ever holds that
+        period's events, so memory stays constant. Nothing is simulated
+        until the consumer asks for the next period, so it can pace the
+        feed or close() the generator to abandon the match. The random
+        draws are those of simulate(), so the last update's totals and the
+        concatenated events equal simulate()'s result from the same RNG.
+        """
+        home_chance_prob, away_chance_prob = self._start(use_randomness, detail_level)
+        possession = self._home_possession()
+        possession = (round(possession, 1), round(100 - possession, 1))
+        
+        for minute in self.PERIOD_MINUTES:
+            self.events = []
+            self._simulate_period(minute, home_chance_prob, away_chance_prob)
+            yield MatchUpdate(
+                minute=minute,
+                home_score=self.home_score,
+                away_score=self.away_score,
+                home_xg=round(self.home_xg, 2),
+                away_xg=round(self.away_xg, 2),
+                possession=possession,
+                shots=(self.home_shots, self.away_shots),
+                shots_on_target=(self.home_sot, self.away_sot),
+                # Goal minutes stay within two of their period, so periods never interleave
+                events=sorted(self.events, key=lambda e: e.minute)
+            )
+    
+    def _start(self, use_randomness: bool, detail_level: str) -> Tuple[float, float]:
+        """Validate and prepare a run; returns the (home, away) chance probabilities"""
+        if detail_level not in DETAIL_LEVELS:
+            raise ValueError(f"detail_level must be one of {DETAIL_LEVELS}, got {detail_level!r}")
+        self.detail_level = detail_level
+        if not use_randomness:
+            self.rng = random.Random(42)
+        
+        # Per-shooter xG only depends on the two profiles, so resolve it once
+        home_profile = self.home.sim_profile
+        away_profile = self.away.sim_profile
+        self._home_chance_xg = home_profile.chance_xgs(away_profile)
+        self._away_chance_xg = away_profile.chance_xgs(home_profile)
+        
+        return self.chance_probabilities(self.home, self.away)
+    
+    def _home_possession(self) -> float:
+        """Home possession % based on midfield"""
+        total_midfield = self.home.midfield_rating + self.away.midfield_rating
+        return (self.home.midfield_rating / total_midfield) * 100
+    
+    @classmethod
+    def chance_probabilities(cls, home: TeamState, away: TeamState) -> Tuple[float, float]:
+        """Probability that a single attempt becomes a chance, for (home, away)"""
+        # Calculate base chance creation rates
+        home_attack_strength = home.attack_rating + home.midfield_rating * 0.3
+        away_defense_strength = away.defense_rating + away.midfield_rating * 0.3
         
-        # Calculate chance creation probabilities
-        home_chance_prob = (home_atk / 100) * (1 - away_def / 200) * self.BASE_GOAL_PROBABILITY
-        away_chance_prob = (away_atk / 100) * (1 - home_def / 200) * self.BASE_GOAL_PROBABILITY
+        away_attack_strength = away.attack_rating + away.midfield_rating * 0.3
+        home_defense_strength = home.defense_rating + home.midfield_rating * 0.3
+        
+        # Home advantage
+        home_attack_strength *= 1.1
+        home_defense_strength *= 1.05
+        
+        home_chance_prob = (home_attack_strength / 100) * (1 - away_defense_strength / 200) * cls.BASE_GOAL_PROBABILITY
+        away_chance_prob = (away_attack_strength / 100) * (1 - home_defense_strength / 200) * cls.BASE_GOAL_PROBABILITY
+        return home_chance_prob, away_chance_prob
+    
+    def _simulate_period(self, minute: int, home_chance_prob: float, away_chance_prob: float):
+        """Simulate a 5-minute period"""
         
         # Multiple attempts per 5-minute chunk
-        for _ in range(3):
+        for _ in range(self.ATTEMPTS_PER_PERIOD):
             # Home team chance
-            if random.random() < home_chance_prob:
+            if self.rng.random() < home_chance_prob:
                 self._process_chance("home", minute)
             
             # Away team chance
-            if random.random() < away_chance_prob:
+            if self.rng.random() < away_chance_prob:
                 self._process_chance("away", minute)
     
     def _process_chance(self, team: str, minute: int):
         """Process a goal-scoring chance"""
         is_home = team == "home"
         attacking_team = self.home if is_home else self.away
-        defending_team = self.away if is_home else self.home
-        
-        # Select attacker
-        attackers = [p for p in attacking_team.players if p.position in ["ST", "LW", "RW", "CAM", "CM"]]
-        if not attackers:
-            attackers = attacking_team.players
-        
-        # Weight by shooting and goals/minutes ratio (form)
-        weights = [p.shooting * (1 + p.goals / max(p.minutes / 90, 1)) for p in attackers]
-        attacker = random.choices(attackers, weights=weights)[0]
-        
-        # Calculate xG for this chance
-        base_xg = attacker.shooting / 100
-        
-        # Adjust for defender quality
-        defenders = [p for p in defending_team.players if p.position in ["CB", "GK", "LB", "RB"]]
-        avg_defense = sum(p.defense for p in defenders) / len(defenders) if defenders else 50
-        base_xg *= (1 - avg_defense / 300)
         
-        # Adjust for goalkeeper
-        gk = next((p for p in defending_team.players if p.position == "GK"), None)
-        if gk:
-            base_xg *= (1 - gk.overall / 300)
+        profile = attacking_team.sim_profile
+        chance_xg = self._home_chance_xg if is_home else self._away_chance_xg
         
-        xg = max(0.05, min(0.95, base_xg))  # Clamp between 5% and 95%
+        # Select attacker
+        shooter = self.rng.choices(range(len(profile.shooters)), cum_weights=profile.cum_weights)[0]
+        attacker = profile.shooters[shooter]
+        xg = chance_xg[shooter]
         
         if is_home:
             self.home_xg += xg
@@ -315,7 +615,7 @@ class MatchSimulator:
             self.away_shots += 1
         
         # Determine if goal scored
-        if random.random() < xg:
+        if self.rng.random() < xg:
             if is_home:
                 self.home_score += 1
                 self.home_sot += 1
@@ -323,71 +623,99 @@ class MatchSimulator:
                 self.away_score += 1
                 self.away_sot += 1
             
-            self.events.append(MatchEvent(
-                minute=minute + random.randint(-2, 2),
-                type="goal",
-                team=team,
-                player=attacker.player_name,
-                description=f"Goal! {attacker.player_name} scores for {attacking_team.name}"
-            ))
+            goal_minute = minute + self.rng.randint(-2, 2)
+            if self.detail_level != "summary":
+                self.events.append(MatchEvent(
+                    minute=goal_minute,
+                    type="goal",
+                    team=team,
+                    player=attacker.player_name,
+                    description=f"Goal! {attacker.player_name} scores for {attacking_team.name}"
+                    if self.detail_level == "full" else ""
+                ))
         else:
             # Miss
-            if random.random() < 0.3:  # 30% of misses are on target
+            if self.rng.random() < ON_TARGET_MISS_RATE:  # 30% of misses are on target
                 if is_home:
                     self.home_sot += 1
                 else:
                     self.away_sot += 1
 
 
-class LeagueSimulator:
-    """Simulates an entire league season"""
+def _binomial_pmf(n: int, p: float) -> List[float]:
+    p = max(0.0, min(1.0, p))
+    return [math.comb(n, k) * p ** k * (1 - p) ** (n - k) for k in range(n + 1)]
+
+
+def outcome_distribution(home: TeamState, away: TeamState) -> OutcomeDistribution:
+    """
+    Exact result probabilities for a fixture.
     
-    def __init__(self, teams: List[TeamState]):
-        self.teams = {t.name: t for t in teams}
-        self.standings = {t.name: {"played": 0, "won": 0, "drawn": 0, "lost": 0, 
-                                    "gf": 0, "ga": 0, "gd": 0, "points": 0} for t in teams}
-        self.fixtures: List[Tuple[str, str]] = []
-        self.results: List[MatchResult] = []
-        
-        self._generate_fixtures()
+    Every attempt is an independent Bernoulli trial and every chance converts
+    with the shooter-weighted average xG, so each side's goals follow a
+    binomial over CHANCES_PER_MATCH attempts. No sampling involved.
+    """
+    n = MatchSimulator.CHANCES_PER_MATCH
+    home_chance_prob, away_chance_prob = MatchSimulator.chance_probabilities(home, away)
+    home_profile = home.sim_profile
+    away_profile = away.sim_profile
+    home_rate = max(0.0, min(1.0, home_chance_prob)) * home_profile.conversion_probability(away_profile)
+    away_rate = max(0.0, min(1.0, away_chance_prob)) * away_profile.conversion_probability(home_profile)
     
-    def _generate_fixtures(self):
-        """Generate round-robin fixtures"""
-        team_names = list(self.teams.keys())
-        n = len(team_names)
-        
-        for i in range(n):
-            for j in range(i + 1, n):
-                self.fixtures.append((team_names[i], team_names[j]))
-                self.fixtures.append((team_names[j], team_names[i]))
-        
-        random.shuffle(self.fixtures)
+    home_goals = _binomial_pmf(n, home_rate)
+    away_goals = _binomial_pmf(n, away_rate)
     
-    def simulate_matchday(self, num_matches: int = 5) -> List[MatchResult]:
-        """Simulate the next batch of matches"""
-        matchday_results = []
-        
-        for _ in range(min(num_matches, len(self.fixtures))):
-            if not self.fixtures:
-                break
-            
-            home_name, away_name = self.fixtures.pop(0)
-            home_team = self.teams[home_name]
-            away_team = self.teams[away_name]
-            
-            simulator = MatchSimulator(home_team, away_team)
-            result = simulator.simulate()
-            
-            self._update_standings(result)
-            self.results.append(result)
-            matchday_results.append(result)
-        
-        return matchday_results
+    draw = 0.0
+    home_win = 0.0
+    away_below = 0.0  # P(away scores < k)
+    for k in range(n + 1):
+        home_win += home_goals[k] * away_below
+        draw += home_goals[k] * away_goals[k]
+        away_below += away_goals[k]
+    
+    return OutcomeDistribution(
+        home_team=home.name,
+        away_team=away.name,
+        home_win=home_win,
+        draw=draw,
+        away_win=max(0.0, 1.0 - home_win - draw),
+        home_goals=home_goals,
+        away_goals=away_goals,
+        home_xg=n * home_rate,
+        away_xg=n * away_rate
+    )
+
+
+class StandingsTable:
+    """
+    League table kept in rank order as results are applied.
+    
+    Teams are ordered by (points, gd, gf) with ties in entry order. Each
+    update moves two teams within a sorted key list, so rank lookups are a
+    bisect and top-k reads a slice; nothing re-sorts the whole table.
+    """
+    
+    def __init__(self, team_names: Sequence[str]):
+        self.rows: Dict[str, dict] = {name: {"played": 0, "won": 0, "drawn": 0, "lost": 0,
+                                             "gf": 0, "ga": 0, "gd": 0, "points": 0} for name in team_names}
+        self._entry = {name: i for i, name in enumerate(self.rows)}
+        self._keys = {name: self._key(name) for name in self.rows}
+        self._order = sorted(self._keys.values())
+    
+    def _key(self, name: str) -> Tuple[int, int, int, int, str]:
+        row = self.rows[name]
+        return (-row["points"], -row["gd"], -row["gf"], self._entry[name], name)
+    
+    def _reindex(self, name: str):
+        old = self._keys[name]
+        del self._order[bisect_left(self._order, old)]
+        new = self._keys[name] = self._key(name)
+        insort(self._order, new)
     
-    def _update_standings(self, result: MatchResult):
+    def apply(self, result: Union[MatchResult, MatchSummary]):
         """Update league table after a match"""
-        home = self.standings[result.home_team]
-        away = self.standings[result.away_team]
+        home = self.rows[result.home_team]
+        away = self.rows[result.away_team]
         
         home["played"] += 1
         away["played"] += 1
@@ -411,15 +739,326 @@ class LeagueSimulator:
             away["drawn"] += 1
             home["points"] += 1
             away["points"] += 1
+        
+        self._reindex(result.home_team)
+        self._reindex(result.away_team)
+    
+    def rank(self, name: str) -> int:
+        """1-based league position of a team"""
+        return bisect_left(self._order, self._keys[name]) + 1
+    
+    def top(self, k: int) -> List[Tuple[str, dict]]:
+        return [(key[-1], self.rows[key[-1]]) for key in self._order[:k]]
+    
+    def ranked(self) -> List[Tuple[str, dict]]:
+        return self.top(len(self._order))
+
+
+def round_robin_schedule(team_names: Sequence[str]) -> List[List[Tuple[str, str]]]:
+    """
+    Double round-robin matchdays via the circle method.
+    
+    Every team plays at most once per matchday (odd leagues get a bye) and
+    the second half repeats the first with home and away swapped.
+    """
+    teams: List[Optional[str]] = list(team_names)
+    if len(teams) % 2:
+        teams.append(None)  # Bye
+    n = len(teams)
+    
+    first_half = []
+    for r in range(n - 1):
+        matchday = []
+        for i in range(n // 2):
+            a, b = teams[i], teams[n - 1 - i]
+            if a is None or b is None:
+                continue
+            # Alternate venues so the pivot team doesn't stay at home all season
+            matchday.append((a, b) if (r + i) % 2 == 0 else (b, a))
+        first_half.append(matchday)
+        # Keep the first team fixed and rotate the rest
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    
+    second_half = [[(away, home) for home, away in matchday] for matchday in first_half]
+    return first_half + second_half
+
+
+# Snapshot file: magic, version byte, zlib-compressed pickle of the league state
+SNAPSHOT_MAGIC = b"MOLTSNAP"
+SNAPSHOT_VERSION = 1
+# Journal entry header: payload length, crc32 of the payload
+_JOURNAL_ENTRY = struct.Struct("<II")
+
+
+def _play_fixture(home: TeamState, away: TeamState, rng_seed: str,
+                  detail_level: str = "full") -> Union[MatchResult, MatchSummary]:
+    """Module-level so fixtures can be shipped to process pools"""
+    return MatchSimulator(home, away, rng=random.Random(rng_seed)).simulate(detail_level=detail_level)
+
+
+class LeagueSimulator:
+    """
+    Simulates an entire league season.
+    
+    Every fixture runs on its own Random derived from (season seed, fixture
+    id), so a season replays identically from its seed and any single match
+    can be reproduced on its own with fixture_rng().
+    
+    With an archive (e.g. archive.ResultArchive), finished matches are
+    appended to it instead of being kept in self.results. With a form
+    tracker (form.FormTracker), every result updates its players' form,
+    which later fixtures then play with; the league then plays shallow
+    copies of the teams (see self.teams), so the caller's TeamStates keep
+    their season totals.
+    
+    save() writes a full snapshot; after that every matchday is appended to
+    a journal beside it, so load() restores the season without replaying
+    any matches.
+    """
+    
+    def __init__(self, teams: List[TeamState], seed: Optional[int] = None,
+                 rng: Optional[random.Random] = None, executor: Optional[Executor] = None,
+                 detail_level: str = "full", archive=None, form=None):
+        if detail_level not in DETAIL_LEVELS:
+            raise ValueError(f"detail_level must be one of {DETAIL_LEVELS}, got {detail_level!r}")
+        if form is not None and detail_level == "summary":
+            raise ValueError("form tracking needs goal events; use detail_level 'goals' or 'full'")
+        self.detail_level = detail_level
+        if seed is None:
+            seed = (rng if rng is not None else random).getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.fixtures_played = 0
+        # Optional thread/process pool for running a matchday's fixtures concurrently
+        self.executor = executor
+        self.archive = archive
+        self.form = form
+        self._journal_path: Optional[str] = None
+        
+        if form is not None:
+            teams = [copy.copy(team) for team in teams]
+            for team in teams:
+                form.attach(team)
+        self.teams = {t.name: t for t in teams}
+        self.table = StandingsTable([t.name for t in teams])
+        self.standings = self.table.rows
+        self.matchdays: Deque[List[Tuple[str, str]]] = deque()
+        self.results: List[Union[MatchResult, MatchSummary]] = []
+        
+        self._generate_fixtures()
+    
+    def _generate_fixtures(self):
+        """Generate round-robin matchdays"""
+        team_names = list(self.teams.keys())
+        self.rng.shuffle(team_names)
+        self.matchdays.extend(round_robin_schedule(team_names))
+    
+    @property
+    def fixtures(self) -> List[Tuple[str, str]]:
+        """Remaining fixtures in schedule order"""
+        return [fixture for matchday in self.matchdays for fixture in matchday]
+    
+    def simulate_matchday(self, num_matches: Optional[int] = None) -> List[Union[MatchResult, MatchSummary]]:
+        """
+        Simulate the next matchday (or its next num_matches fixtures).
+        
+        No team appears twice in a matchday, so its fixtures run
+        concurrently when an executor is set; standings are applied once
+        all of them have finished, in schedule order.
+        """
+        if not self.matchdays:
+            return []
+        
+        first_id = self.fixtures_played
+        batch = self._next_fixtures(num_matches)
+        homes = [self.teams[home] for home, _ in batch]
+        aways = [self.teams[away] for _, away in batch]
+        seeds = [self._fixture_seed(first_id + i) for i in range(len(batch))]
+        detail = [self.detail_level] * len(batch)
+        
+        if self.executor is not None:
+            matchday_results = list(self.executor.map(_play_fixture, homes, aways, seeds, detail))
+        else:
+            matchday_results = list(map(_play_fixture, homes, aways, seeds, detail))
+        
+        for fixture_id, result in enumerate(matchday_results, first_id):
+            self._update_standings(result)
+            self._update_form(result)
+            if self.archive is not None:
+                self.archive.append(result, season=str(self.seed), fixture=fixture_id)
+            else:
+                self.results.append(result)
+        self._journal(first_id, matchday_results)
+        
+        return matchday_results
+    
+    def _next_fixtures(self, num_matches: Optional[int]) -> List[Tuple[str, str]]:
+        """Take the next matchday (or its first num_matches fixtures) off the schedule"""
+        matchday = self.matchdays[0]
+        batch = matchday[:num_matches] if num_matches is not None else matchday
+        if len(batch) < len(matchday):
+            self.matchdays[0] = matchday[len(batch):]
+        else:
+            self.matchdays.popleft()
+        self.fixtures_played += len(batch)
+        return batch
+    
+    def save(self, path: str):
+        """
+        Atomically write a full snapshot to path and start an empty journal.
+        
+        The executor and archive are not saved; pass them to load() again.
+        Saving again compacts the journal into the new snapshot. Buffered
+        archive rows are flushed first, since the snapshot counts them as
+        played.
+        """
+        if self.archive is not None:
+            self.archive.flush()
+        state = {
+            "seed": self.seed,
+            "rng": self.rng.getstate(),
+            "fixtures_played": self.fixtures_played,
+            "detail_level": self.detail_level,
+            "teams": list(self.teams.values()),
+            "table": self.table,
+            "matchdays": list(self.matchdays),
+            "results": self.results,
+            "form": self.form,
+        }
+        payload = zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL))
+        
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION]) + payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        
+        # Entries left over from the old snapshot are skipped on load, so a
+        # crash before this truncation is harmless
+        self._journal_path = path + ".journal"
+        open(self._journal_path, "wb").close()
+    
+    @classmethod
+    def load(cls, path: str, executor: Optional[Executor] = None, archive=None) -> "LeagueSimulator":
+        """Restore a league from a snapshot and replay its journal"""
+        with open(path, "rb") as f:
+            data = f.read()
+        header = SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION])
+        if not data.startswith(header):
+            raise ValueError(f"{path} is not a version {SNAPSHOT_VERSION} league snapshot")
+        state = pickle.loads(zlib.decompress(data[len(header):]))
+        
+        league = cls.__new__(cls)
+        league.detail_level = state["detail_level"]
+        league.seed = state["seed"]
+        league.rng = random.Random()
+        league.rng.setstate(state["rng"])
+        league.fixtures_played = state["fixtures_played"]
+        league.executor = executor
+        league.archive = archive
+        league.teams = {t.name: t for t in state["teams"]}
+        league.table = state["table"]
+        league.standings = league.table.rows
+        league.matchdays = deque(state["matchdays"])
+        league.results = state["results"]
+        league.form = state["form"]
+        
+        league._journal_path = path + ".journal"
+        league._replay_journal()
+        if archive is not None:
+            league._drop_unjournaled_rows()
+        return league
+    
+    def _journal(self, first_id: int, results: List[Union[MatchResult, MatchSummary]]):
+        """Durably append one matchday's results to the journal, if saving"""
+        if self._journal_path is None:
+            return
+        if self.archive is not None:
+            self.archive.flush()
+        payload = pickle.dumps((first_id, results), pickle.HIGHEST_PROTOCOL)
+        with open(self._journal_path, "ab") as f:
+            f.write(_JOURNAL_ENTRY.pack(len(payload), zlib.crc32(payload)) + payload)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _replay_journal(self):
+        """Apply journaled matchdays newer than the snapshot; drop a torn tail"""
+        if not os.path.exists(self._journal_path):
+            return
+        with open(self._journal_path, "rb") as f:
+            data = f.read()
+        
+        offset = 0
+        while offset + _JOURNAL_ENTRY.size <= len(data):
+            length, crc = _JOURNAL_ENTRY.unpack_from(data, offset)
+            start = offset + _JOURNAL_ENTRY.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            first_id, results = pickle.loads(payload)
+            if first_id > self.fixtures_played:
+                raise ValueError(f"{self._journal_path} is missing fixtures "
+                                 f"{self.fixtures_played}-{first_id - 1}")
+            if first_id == self.fixtures_played:
+                self._next_fixtures(len(results))
+                for result in results:
+                    self._update_standings(result)
+                    self._update_form(result)
+                    # Archived results were flushed before the entry was written
+                    if self.archive is None:
+                        self.results.append(result)
+            offset = start + length
+        
+        if offset < len(data):
+            os.truncate(self._journal_path, offset)
+    
+    def _drop_unjournaled_rows(self):
+        """
+        Remove this season's archived matches that the journal never recorded.
+        
+        The archive flushes itself every buffer_size matches, possibly in the
+        middle of a matchday; if the process died before that matchday's
+        journal entry was written, those rows would be appended again when
+        the matchday is replayed.
+        """
+        season = self.archive.categories["season"].codes.get(str(self.seed))
+        if season is None or not len(self.archive):
+            return
+        seasons = self.archive.column("matches", "season")
+        fixtures = self.archive.column("matches", "fixture")
+        # Appends are in fixture order, so unjournaled rows are a tail
+        keep = len(seasons)
+        while keep and seasons[keep - 1] == season and fixtures[keep - 1] >= self.fixtures_played:
+            keep -= 1
+        if keep < len(seasons):
+            del seasons, fixtures
+            self.archive.truncate(keep)
+    
+    def _fixture_seed(self, fixture_id: int) -> str:
+        return f"{self.seed}:{fixture_id}"
+    
+    def fixture_rng(self, fixture_id: int) -> random.Random:
+        """Random stream for the fixture_id-th match of this season"""
+        return random.Random(self._fixture_seed(fixture_id))
+    
+    def _update_standings(self, result: Union[MatchResult, MatchSummary]):
+        """Update league table after a match"""
+        self.table.apply(result)
+    
+    def _update_form(self, result: Union[MatchResult, MatchSummary]):
+        if self.form is not None:
+            self.form.update(result, self.teams[result.home_team], self.teams[result.away_team])
     
     def get_standings(self) -> List[Tuple[str, dict]]:
         """Get sorted league table"""
-        sorted_standings = sorted(
-            self.standings.items(),
-            key=lambda x: (x[1]["points"], x[1]["gd"], x[1]["gf"]),
-            reverse=True
-        )
-        return sorted_standings
+        return self.table.ranked()
+    
+    def get_rank(self, team: str) -> int:
+        return self.table.rank(team)
+    
+    def get_top(self, k: int) -> List[Tuple[str, dict]]:
+        return self.table.top(k)
     
     def print_standings(self):
         """Print formatted league table"""
@@ -435,13 +1074,145 @@ class LeagueSimulator:
         print("=" * 70)
 
 
-def create_sample_team(name: str, overall: int) -> TeamState:
+class EngineProfiler:
+    """
+    Opt-in call counts and cumulative wall time per engine phase.
+    
+    While enabled, every method in PROFILED_PHASES is swapped for a timed
+    wrapper; disabling restores the originals, so a disabled profiler costs
+    nothing. Times are inclusive (match.simulate contains match.chance).
+    Listeners receive (phase, elapsed_ns) for every recorded call.
+    """
+    
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+        self.total_ns: Dict[str, int] = {}
+        self.listeners: List[Callable[[str, int], None]] = []
+        self._originals: Dict[str, object] = {}
+        self._depth = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self._depth > 0
+    
+    def record(self, phase: str, elapsed_ns: int):
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self.total_ns[phase] = self.total_ns.get(phase, 0) + elapsed_ns
+        for listener in self.listeners:
+            listener(phase, elapsed_ns)
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Time an arbitrary block (e.g. a scheduler step) when enabled"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+    
+    def enable(self):
+        self._depth += 1
+        if self._depth > 1:
+            return
+        for phase, (owner, attr) in PROFILED_PHASES.items():
+            original = owner.__dict__[attr]
+            self._originals[phase] = original
+            if isinstance(original, classmethod):
+                setattr(owner, attr, classmethod(self._timed(phase, original.__func__)))
+            else:
+                setattr(owner, attr, self._timed(phase, original))
+    
+    def disable(self):
+        if self._depth == 0:
+            return
+        self._depth -= 1
+        if self._depth:
+            return
+        for phase, (owner, attr) in PROFILED_PHASES.items():
+            setattr(owner, attr, self._originals.pop(phase))
+    
+    def reset(self):
+        self.calls.clear()
+        self.total_ns.clear()
+    
+    def _timed(self, phase: str, func):
+        record = self.record
+        
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(phase, time.perf_counter_ns() - start)
+        return timed
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """{phase: {"calls", "total_ns", "mean_ns"}}"""
+        return {
+            phase: {
+                "calls": calls,
+                "total_ns": self.total_ns[phase],
+                "mean_ns": self.total_ns[phase] / calls if calls else 0.0,
+            }
+            for phase, calls in sorted(self.calls.items())
+        }
+    
+    def to_prometheus(self, prefix: str = "moltball_engine") -> str:
+        """Snapshot in Prometheus text exposition format"""
+        lines = [
+            f"# HELP {prefix}_phase_calls_total Engine phase invocations",
+            f"# TYPE {prefix}_phase_calls_total counter",
+        ]
+        lines += [f'{prefix}_phase_calls_total{{phase="{phase}"}} {calls}'
+                  for phase, calls in sorted(self.calls.items())]
+        lines += [
+            f"# HELP {prefix}_phase_seconds_total Cumulative time spent in engine phase",
+            f"# TYPE {prefix}_phase_seconds_total counter",
+        ]
+        lines += [f'{prefix}_phase_seconds_total{{phase="{phase}"}} {self.total_ns[phase] / 1e9:.9f}'
+                  for phase in sorted(self.total_ns)]
+        return "\n".join(lines) + "\n"
+
+
+# phase name -> (class, attribute) instrumented while profiling
+PROFILED_PHASES = {
+    "team.calculate_ratings": (TeamState, "_calculate_ratings"),
+    "team.select_lineup": (TeamState, "_select_lineup"),
+    "team.build_profile": (SimProfile, "build"),
+    "match.simulate": (MatchSimulator, "simulate"),
+    "match.period": (MatchSimulator, "_simulate_period"),
+    "match.chance": (MatchSimulator, "_process_chance"),
+    "league.matchday": (LeagueSimulator, "simulate_matchday"),
+    "league.update_standings": (LeagueSimulator, "_update_standings"),
+}
+
+PROFILER = EngineProfiler()
+
+
+@contextmanager
+def profile_engine(reset: bool = True):
+    """Instrument the engine for the duration of the block and yield the profiler"""
+    if reset:
+        PROFILER.reset()
+    PROFILER.enable()
+    try:
+        yield PROFILER
+    finally:
+        PROFILER.disable()
+
+
+def create_sample_team(name: str, overall: int, rng: Optional[random.Random] = None) -> TeamState:
     """Create a sample team with random players"""
+    rng = rng if rng is not None else random
     positions = ["GK", "LB", "CB", "CB", "RB", "CDM", "CM", "CM", "LW", "ST", "RW"]
     players = []
     
     for pos in positions:
-        variation = random.randint(-10, 10)
+        variation = rng.randint(-10, 10)
         player_overall = max(60, min(99, overall + variation))
         
         players.append(PlayerStats(
@@ -450,21 +1221,21 @@ def create_sample_team(name: str, overall: int) -> TeamState:
             club=name,
             position=pos,
             overall=player_overall,
-            pace=random.randint(50, 95),
-            shooting=random.randint(40, 90) if pos != "GK" else 20,
-            passing=random.randint(50, 90),
-            dribbling=random.randint(50, 95),
-            defense=random.randint(60, 95) if pos in ["CB", "LB", "RB", "CDM"] else random.randint(30, 60),
-            physical=random.randint(60, 90),
-            goals=random.randint(0, 30),
-            assists=random.randint(0, 20),
-            minutes=random.randint(1000, 3000)
+            pace=rng.randint(50, 95),
+            shooting=rng.randint(40, 90) if pos != "GK" else 20,
+            passing=rng.randint(50, 90),
+            dribbling=rng.randint(50, 95),
+            defense=rng.randint(60, 95) if pos in ["CB", "LB", "RB", "CDM"] else rng.randint(30, 60),
+            physical=rng.randint(60, 90),
+            goals=rng.randint(0, 30),
+            assists=rng.randint(0, 20),
+            minutes=rng.randint(1000, 3000)
         ))
     
     # Add substitutes
     for i in range(7):
-        pos = random.choice(positions)
-        variation = random.randint(-15, 5)
+        pos = rng.choice(positions)
+        variation = rng.randint(-15, 5)
         player_overall = max(60, min(99, overall + variation))
         
         players.append(PlayerStats(
@@ -473,15 +1244,15 @@ def create_sample_team(name: str, overall: int) -> TeamState:
             club=name,
             position=pos,
             overall=player_overall,
-            pace=random.randint(45, 90),
-            shooting=random.randint(35, 85),
-            passing=random.randint(45, 85),
-            dribbling=random.randint(45, 90),
-            defense=random.randint(40, 85),
-            physical=random.randint(55, 85),
-            goals=random.randint(0, 15),
-            assists=random.randint(0, 10),
-            minutes=random.randint(500, 1500)
+            pace=rng.randint(45, 90),
+            shooting=rng.randint(35, 85),
+            passing=rng.randint(45, 85),
+            dribbling=rng.randint(45, 90),
+            defense=rng.randint(40, 85),
+            physical=rng.randint(55, 85),
+            goals=rng.randint(0, 15),
+            assists=rng.randint(0, 10),
+            minutes=rng.randint(500, 1500)
         ))
     
     return TeamState(name=name, players=players, tactics=Tactics())
@@ -517,7 +1288,7 @@ def demo():
         print(f"MATCHDAY {md}")
         print("=" * 50)
         
-        results = league.simulate_matchday(3)
+        results = league.simulate_matchday()
         
         for result in results:
             print(f"\n{result.home_team} {result.home_score} - {result.away_score} {result.away_team}")
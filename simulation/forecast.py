@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Moltball Season Forecasting
+
+Replays full double round-robin seasons many times over a process pool and
+aggregates where each team finishes. Workers simulate chunks of seasons with
+the batch engine on their own seeded NumPy generator and only send position
+counts back, never individual match results.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .batch import BatchMatchSimulator
+from .engine import TeamState
+
+
+@dataclass
+class SeasonForecast:
+    teams: List[str]
+    seasons: int
+    position_counts: np.ndarray  # [team, position - 1] -> number of seasons
+    total_points: np.ndarray  # [team] -> points summed over all seasons
+
+    def position_probabilities(self) -> Dict[str, List[float]]:
+        """P(finishing in each position) per team"""
+        probs = self.position_counts / max(self.seasons, 1)
+        return {team: probs[i].tolist() for i, team in enumerate(self.teams)}
+
+    def top_probability(self, team: str, places: int = 1) -> float:
+        i = self.teams.index(team)
+        return float(self.position_counts[i, :places].sum() / max(self.seasons, 1))
+
+    def bottom_probability(self, team: str, places: int = 3) -> float:
+        i = self.teams.index(team)
+        return float(self.position_counts[i, -places:].sum() / max(self.seasons, 1))
+
+    def summary(self, top: int = 4, relegated: int = 3) -> List[dict]:
+        """P(title), P(top-N), P(relegation) and expected points, best first"""
+        rows = [{
+            "team": team,
+            "expected_points": round(float(self.total_points[i] / max(self.seasons, 1)), 2),
+            "title": self.top_probability(team, 1),
+            f"top_{top}": self.top_probability(team, top),
+            "relegation": self.bottom_probability(team, relegated),
+        } for i, team in enumerate(self.teams)]
+        return sorted(rows, key=lambda r: r["expected_points"], reverse=True)
+
+
+# Teams are sent to each worker once, via the pool initializer
+_worker_teams: List[TeamState] = []
+
+
+def _init_worker(teams: List[TeamState]):
+    global _worker_teams
+    _worker_teams = teams
+
+
+def _simulate_seasons(teams: List[TeamState], seed: np.random.SeedSequence,
+                      seasons: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate a chunk of seasons; returns (position counts, points summed)"""
+    sim = BatchMatchSimulator(rng=np.random.default_rng(seed))
+    n_teams = len(teams)
+    points = np.zeros((seasons, n_teams), dtype=np.int64)
+    gf = np.zeros((seasons, n_teams), dtype=np.int64)
+    ga = np.zeros((seasons, n_teams), dtype=np.int64)
+
+    for h in range(n_teams):
+        for a in range(n_teams):
+            if h == a:
+                continue
+            result = sim.simulate(teams[h], teams[a], seasons)
+            home_score, away_score = result.home_score, result.away_score
+            gf[:, h] += home_score
+            ga[:, h] += away_score
+            gf[:, a] += away_score
+            ga[:, a] += home_score
+            points[:, h] += np.where(home_score > away_score, 3, np.where(home_score == away_score, 1, 0))
+            points[:, a] += np.where(away_score > home_score, 3, np.where(home_score == away_score, 1, 0))
+
+    # Same ordering as LeagueSimulator.get_standings: points, gd, gf, then entry order
+    entry_order = np.broadcast_to(np.arange(n_teams), (seasons, n_teams))
+    order = np.lexsort((entry_order, -gf, -(gf - ga), -points), axis=-1)
+
+    counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+    for position in range(n_teams):
+        counts[:, position] = np.bincount(order[:, position], minlength=n_teams)
+    return counts, points.sum(axis=0)
+
+
+def _run_chunk(seed: np.random.SeedSequence, seasons: int) -> Tuple[np.ndarray, np.ndarray]:
+    return _simulate_seasons(_worker_teams, seed, seasons)
+
+
+class ParallelSeasonRunner:
+    """
+    Forecasts final standings from many full-season replays.
+
+    Seasons are split into fixed-size chunks, each with its own child of the
+    root SeedSequence, so a given seed gives the same forecast regardless of
+    how many workers run it.
+    """
+
+    def __init__(self, teams: List[TeamState], seed: Optional[int] = None,
+                 workers: Optional[int] = None, chunk_size: int = 500):
+        self.teams = teams
+        self.seed = seed
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+
+    def run(self, seasons: int) -> SeasonForecast:
+        chunks = [min(self.chunk_size, seasons - start) for start in range(0, seasons, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(chunks))
+
+        n_teams = len(self.teams)
+        counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+        total_points = np.zeros(n_teams, dtype=np.int64)
+
+        if self.workers <= 1 or len(chunks) <= 1:
+            partials = [_simulate_seasons(self.teams, s, n) for s, n in zip(seeds, chunks)]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.teams,)) as pool:
+                partials = list(pool.map(_run_chunk, seeds, chunks))
+
+        for chunk_counts, chunk_points in partials:
+            counts += chunk_counts
+            total_points += chunk_points
+
+        return SeasonForecast(
+            teams=[t.name for t in self.teams],
+            seasons=seasons,
+            position_counts=counts,
+            total_points=total_points
+        )
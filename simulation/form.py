@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Moltball Live Form
+
+Tracks each player's recent goals, minutes and shots from simulated
+matches so shooter selection follows form instead of the static season
+totals on PlayerStats. Every stat is an exponentially-decayed window over
+the player's team's matches: a match k team-matches ago counts decay**k,
+and the season totals seed the window as the oldest evidence.
+
+State lives in flat typed arrays indexed by player slot. Decay is applied
+lazily from a per-team match counter, so an update touches only the two
+squads involved and a lookup touches one slot, however many teams and
+matches the tracker has seen.
+"""
+
+from array import array
+from typing import Dict, List, NamedTuple, Tuple, Union
+
+from .engine import MatchResult, MatchSummary, TeamState
+from .players import _Categories
+
+FULL_MATCH_MINUTES = 90
+
+
+class PlayerForm(NamedTuple):
+    goals: float
+    minutes: float
+    shots: float
+
+
+class FormTracker:
+    """
+    Decayed per-player goals/minutes/shots, updated one result at a time.
+
+    Results only name goal scorers, so a side's missed shots are credited
+    to its shooters by their share of shot selection in the profile the
+    match was played with (as are goals when two shooters share a name).
+    Minutes go to the selected lineup. After each update both teams'
+    TeamState.form is refreshed, which the engine reads in place of the
+    season totals until detach() clears it. LeagueSimulator attaches its
+    own copies of the teams, so callers' teams are never touched.
+
+    Players are identified by team, name and which same-named squad member
+    they are, so squads with repeated names keep separate form.
+    """
+
+    STAT_COLUMNS = ("goals", "minutes", "shots")
+
+    def __init__(self, half_life: float = 10.0, capacity: int = 1024):
+        self.half_life = half_life
+        self.decay = 0.5 ** (1 / half_life)
+        capacity = max(1, capacity)
+        self.teams = _Categories()
+        self._team_matches = array("I")
+        self._slots: Dict[Tuple[int, str, int], int] = {}
+        self._squads: Dict[int, Tuple[Tuple[str, ...], List[int]]] = {}  # Team code -> (names, slots)
+        self._stats = {column: array("d", bytes(8 * capacity)) for column in self.STAT_COLUMNS}
+        self._team = array("I", bytes(4 * capacity))
+        self._stamp = array("I", bytes(4 * capacity))  # Team match count the stats are decayed to
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def lookup(self, team: str, player: str, occurrence: int = 0) -> PlayerForm:
+        """Current decayed form of one player (the occurrence-th of that name in the squad)"""
+        code = self.teams.codes.get(team)
+        slot = self._slots.get((code, player, occurrence)) if code is not None else None
+        if slot is None:
+            raise KeyError(f"no form for {player!r} of {team!r}")
+        self._settle(slot)
+        return PlayerForm(*(self._stats[column][slot] for column in self.STAT_COLUMNS))
+
+    def attach(self, team: TeamState):
+        """Point a team at its tracked form (seeded from season totals when new)"""
+        team.form = self._team_form(self._team_code(team.name), team)
+
+    def detach(self, team: TeamState):
+        """Return a team to its season totals; its tracked form is kept for lookup()"""
+        team.form = None
+
+    def update(self, result: Union[MatchResult, MatchSummary], home: TeamState, away: TeamState):
+        """Fold one finished match into both squads' form"""
+        if (result.home_team, result.away_team) != (home.name, away.name):
+            raise ValueError(f"result {result.home_team} v {result.away_team} "
+                             f"does not match {home.name} v {away.name}")
+        events = getattr(result, "events", None)
+        if events is None:
+            raise ValueError("form tracking needs goal events; use detail_level 'goals' or 'full'")
+
+        for side, team in enumerate((home, away)):
+            code = self._team_code(team.name)
+            self._team_matches[code] += 1
+
+            scorers: Dict[str, int] = {}
+            for event in events:
+                if event.type == "goal" and event.team == ("home", "away")[side] and event.player is not None:
+                    scorers[event.player] = scorers.get(event.player, 0) + 1
+
+            # The profile the match was played with decides who took the misses
+            profile = team.sim_profile
+            squad = self._squad_slots(code, team)
+            slot_of = dict(zip(map(id, team.players), squad))
+            misses = result.shots[side] - sum(scorers.values())
+            total_weight = profile.cum_weights[-1]
+            name_weight: Dict[str, float] = {}
+            for player, weight in zip(profile.shooters, profile.weights):
+                name_weight[player.player_name] = name_weight.get(player.player_name, 0.0) + weight
+
+            goals, minutes, shots = (self._stats[column] for column in self.STAT_COLUMNS)
+            for player, weight in zip(profile.shooters, profile.weights):
+                slot = slot_of[id(player)]
+                scored = scorers.get(player.player_name, 0) * weight / name_weight[player.player_name]
+                goals[slot] += scored
+                shots[slot] += scored + misses * weight / total_weight
+            for player in team._select_lineup():
+                minutes[slot_of[id(player)]] += FULL_MATCH_MINUTES
+
+            team.form = tuple(zip([goals[slot] for slot in squad], [minutes[slot] for slot in squad]))
+
+    def _team_code(self, name: str) -> int:
+        code = self.teams.encode(name)
+        if code == len(self._team_matches):
+            self._team_matches.append(0)
+        return code
+
+    def _team_form(self, code: int, team: TeamState) -> Tuple[Tuple[float, float], ...]:
+        goals, minutes = self._stats["goals"], self._stats["minutes"]
+        return tuple((goals[slot], minutes[slot]) for slot in self._squad_slots(code, team))
+
+    def _squad_slots(self, code: int, team: TeamState) -> List[int]:
+        """Settled slots of a squad in player order, reused while its names are unchanged"""
+        names = tuple(player.player_name for player in team.players)
+        cached = self._squads.get(code)
+        if cached is not None and cached[0] == names:
+            for slot in cached[1]:
+                self._settle(slot)
+            return cached[1]
+
+        occurrences: Dict[str, int] = {}
+        slots = []
+        for player in team.players:
+            occurrence = occurrences.get(player.player_name, 0)
+            occurrences[player.player_name] = occurrence + 1
+            slots.append(self._slot(code, player, occurrence))
+        self._squads[code] = (names, slots)
+        return slots
+
+    def _slot(self, code: int, player, occurrence: int) -> int:
+        """Slot of a player decayed to their team's latest match, created on first sight"""
+        key = (code, player.player_name, occurrence)
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._settle(slot)
+            return slot
+
+        slot = self._slots[key] = len(self._slots)
+        if slot == len(self._team):
+            # Full: double every column
+            for column in self._stats.values():
+                column.extend(array("d", bytes(8 * len(column))))
+            self._team.extend(array("I", bytes(4 * len(self._team))))
+            self._stamp.extend(array("I", bytes(4 * len(self._stamp))))
+        self._team[slot] = code
+        self._stamp[slot] = self._team_matches[code]
+        self._stats["goals"][slot] = player.goals
+        self._stats["minutes"][slot] = player.minutes
+        self._stats["shots"][slot] = 0.0
+        return slot
+
+    def _settle(self, slot: int):
+        """Apply the decay for team matches played since the slot was last touched"""
+        now = self._team_matches[self._team[slot]]
+        elapsed = now - self._stamp[slot]
+        if elapsed:
+            factor = self.decay ** elapsed
+            for column in self._stats.values():
+                column[slot] *= factor
+            self._stamp[slot] = now
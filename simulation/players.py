@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Moltball Player Store
+
+Struct-of-arrays storage for large player pools (e.g. a full SoFIFA dump).
+Stats live in typed `array` columns, positions/clubs/seasons are stored as
+categorical codes, and PlayerRow gives a lightweight __slots__ view with the
+same attributes as PlayerStats, so rows can be used anywhere the engine
+expects a player.
+"""
+
+import csv
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .engine import SLOT_POSITIONS, PlayerStats, Tactics, TeamState
+
+
+# Column name -> array typecode. Ratings fit in a byte, season totals don't
+STAT_COLUMNS = {
+    "overall": "B",
+    "pace": "B",
+    "shooting": "B",
+    "passing": "B",
+    "dribbling": "B",
+    "defense": "B",
+    "physical": "B",
+    "goals": "H",
+    "assists": "H",
+    "minutes": "I",
+}
+
+CATEGORY_COLUMNS = ("position", "club", "season")
+
+# SoFIFA club positions that say where a player sits rather than plays
+BENCH_POSITIONS = ("", "SUB", "RES")
+# Central roles SoFIFA splits into left/right (LCB, RS, RDM, ...), by their suffix
+SIDED_POSITIONS = {"CB": "CB", "CM": "CM", "DM": "CDM", "AM": "CAM", "S": "ST", "F": "ST"}
+POSITION_ALIASES = {"CF": "ST"}
+
+
+def sofifa_position(club_position: Optional[str], positions: Optional[str] = None) -> str:
+    """
+    Engine position for a SoFIFA player.
+
+    Bench and reserve players take their first listed position from the
+    positions column; left/right variants of central roles lose their side.
+    Anything unrecognised plays CM.
+    """
+    position = (club_position or "").strip().upper()
+    if position in BENCH_POSITIONS:
+        position = (positions or "").split(",")[0].strip().upper()
+    position = POSITION_ALIASES.get(position, position)
+    if position in SLOT_POSITIONS:
+        return position
+    if position[:1] in ("L", "R") and position[1:] in SIDED_POSITIONS:
+        return SIDED_POSITIONS[position[1:]]
+    return "CM"
+
+
+class _Categories:
+    """String <-> small integer code dictionary for one categorical column"""
+    __slots__ = ("names", "codes")
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.names)
+            self.names.append(value)
+        return code
+
+
+class PlayerTable:
+    """Columnar player store; rows are addressed by integer index"""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.stats: Dict[str, array] = {column: array(code) for column, code in STAT_COLUMNS.items()}
+        self.categories: Dict[str, _Categories] = {column: _Categories() for column in CATEGORY_COLUMNS}
+        self.category_codes: Dict[str, array] = {column: array("H") for column in CATEGORY_COLUMNS}
+
+    @classmethod
+    def from_players(cls, players: Iterable[PlayerStats]) -> "PlayerTable":
+        table = cls()
+        table.extend(players)
+        return table
+
+    @classmethod
+    def from_sofifa_csv(cls, csv_path: str, season: str = "2024-25") -> "PlayerTable":
+        """Load a SoFIFA export, streaming rows straight into the columns"""
+        table = cls()
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                table.append(PlayerStats(
+                    player_name=row['name'].strip(),
+                    season=season,
+                    club=row.get('club_name', 'Unknown').strip(),
+                    position=sofifa_position(row.get('club_position'), row.get('positions')),
+                    overall=int(row.get('overall_rating', 70)),
+                    pace=int(row.get('pace', 70)),
+                    shooting=int(row.get('shooting', 70)),
+                    passing=int(row.get('passing', 70)),
+                    dribbling=int(row.get('dribbling', 70)),
+                    defense=int(row.get('defending', 50)),
+                    physical=int(row.get('physicality', 70)),
+                ))
+        return table
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def append(self, player: PlayerStats) -> int:
+        """Add a player and return its row index"""
+        self.names.append(player.player_name)
+        for column in STAT_COLUMNS:
+            self.stats[column].append(getattr(player, column))
+        for column in CATEGORY_COLUMNS:
+            self.category_codes[column].append(self.categories[column].encode(getattr(player, column)))
+        return len(self.names) - 1
+
+    def extend(self, players: Iterable[PlayerStats]):
+        for player in players:
+            self.append(player)
+
+    def row(self, index: int) -> "PlayerRow":
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"player index {index} out of range")
+        return PlayerRow(self, index % len(self))
+
+    def rows(self, indices: Iterable[int]) -> List["PlayerRow"]:
+        return [self.row(i) for i in indices]
+
+    def to_player(self, index: int) -> PlayerStats:
+        """Materialize a row as a standalone PlayerStats"""
+        row = self.row(index)
+        return PlayerStats(**{name: getattr(row, name) for name in PlayerStats.__dataclass_fields__})
+
+    def position_code(self, position: str) -> int:
+        return self.categories["position"].codes.get(position, -1)
+
+    def indices_where(self, position: str) -> List[int]:
+        """Row indices of every player registered at position"""
+        code = self.position_code(position)
+        return [i for i, c in enumerate(self.category_codes["position"]) if c == code]
+
+    def team(self, name: str, indices: Sequence[int], tactics: Optional[Tactics] = None) -> TeamState:
+        return TeamState.from_table(name, self, indices, tactics)
+
+
+def _stat_property(column: str) -> property:
+    return property(lambda row: row.table.stats[column][row.index])
+
+
+def _category_property(column: str) -> property:
+    def get(row):
+        table = row.table
+        return table.categories[column].names[table.category_codes[column][row.index]]
+    return property(get)
+
+
+class PlayerRow:
+    """Read-only view of one PlayerTable row with PlayerStats attributes"""
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: PlayerTable, index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def player_name(self) -> str:
+        return self.table.names[self.index]
+
+    position = _category_property("position")
+    club = _category_property("club")
+    season = _category_property("season")
+
+    overall = _stat_property("overall")
+    pace = _stat_property("pace")
+    shooting = _stat_property("shooting")
+    passing = _stat_property("passing")
+    dribbling = _stat_property("dribbling")
+    defense = _stat_property("defense")
+    physical = _stat_property("physical")
+    goals = _stat_property("goals")
+    assists = _stat_property("assists")
+    minutes = _stat_property("minutes")
+
+    def __eq__(self, other):
+        return isinstance(other, PlayerRow) and other.table is self.table and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.table), self.index))
+
+    def __repr__(self):
+        return f"PlayerRow({self.index}, {self.player_name!r}, {self.position}, {self.overall})"
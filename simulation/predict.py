@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Moltball Rating Predictor
+
+Pre-match probabilities straight from team ratings, without running the
+engine. Each side's goals are Poisson with a log-linear rate in its
+attack/midfield ratings and the opponent's defense/midfield ratings, with a
+Dixon-Coles correction on low scores. Parameters are fitted offline on
+batch engine output and stored in a small JSON calibration file, together
+with the predictor's calibration error against the engine.
+
+Usage: python -m simulation.predict [--fit] [--fixtures N] [--samples N] [--output FILE]
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import BatchMatchSimulator
+from .engine import FORMATIONS, PlayStyle, Tactics, TeamState, create_sample_team, outcome_distribution
+
+DEFAULT_CALIBRATION = Path(__file__).parent / "predictor-calibration.json"
+CALIBRATION_VERSION = 1
+
+# log(goal rate) = coefficients . [1, home, log attack, log midfield, opp defense / 100, opp midfield / 100]
+FEATURES = ["intercept", "home", "log_attack", "log_midfield", "opp_defense", "opp_midfield"]
+MAX_GOALS = 10
+
+
+def _features(attack, midfield, opp_defense, opp_midfield, home) -> np.ndarray:
+    attack, midfield = np.asarray(attack, dtype=float), np.asarray(midfield, dtype=float)
+    return np.stack(np.broadcast_arrays(
+        1.0, float(home), np.log(attack), np.log(midfield),
+        np.asarray(opp_defense, dtype=float) / 100, np.asarray(opp_midfield, dtype=float) / 100
+    ), axis=-1)
+
+
+def _poisson_pmf(rate: np.ndarray) -> np.ndarray:
+    """P(k goals), k = 0..MAX_GOALS, for each rate; shape rate.shape + (MAX_GOALS + 1,)"""
+    k = np.arange(MAX_GOALS + 1)
+    log_factorial = np.array([math.lgamma(i + 1) for i in k])
+    rate = np.asarray(rate, dtype=float)[..., None]
+    return np.exp(k * np.log(rate) - rate - log_factorial)
+
+
+def _dixon_coles_tau(home_goals, away_goals, home_rate, away_rate, rho):
+    """Low-score correction factor for each (home goals, away goals) pair"""
+    tau = np.ones(np.broadcast(home_goals, away_goals, home_rate).shape)
+    tau = np.where((home_goals == 0) & (away_goals == 0), 1 - home_rate * away_rate * rho, tau)
+    tau = np.where((home_goals == 0) & (away_goals == 1), 1 + home_rate * rho, tau)
+    tau = np.where((home_goals == 1) & (away_goals == 0), 1 + away_rate * rho, tau)
+    return np.where((home_goals == 1) & (away_goals == 1), 1 - rho, tau)
+
+
+@dataclass
+class CalibrationReport:
+    fixtures: int
+    samples: int
+    outcome_mae: float  # Mean |predicted - exact engine| over home win, draw, away win
+    outcome_max_error: float
+    goal_rate_mae: float  # Mean |predicted - exact engine| expected goals per side
+    brier: float  # Brier score of predictions on sampled engine results
+    engine_brier: float  # Brier score of the exact engine distribution on the same results
+    reliability: List[Tuple[float, float, int]]  # (mean predicted, observed, count) home-win bins
+
+    def print_summary(self):
+        print(f"\nCalibration against the engine ({self.fixtures} fixtures, {self.samples} samples each)")
+        print(f"  outcome MAE        {self.outcome_mae:.4f} (max {self.outcome_max_error:.4f})")
+        print(f"  goal rate MAE      {self.goal_rate_mae:.4f}")
+        print(f"  Brier              {self.brier:.4f} (engine {self.engine_brier:.4f})")
+        print("  home win reliability")
+        for predicted, observed, count in self.reliability:
+            print(f"     predicted {predicted:.3f}  observed {observed:.3f}  ({count} fixtures)")
+
+
+class RatingPredictor:
+    """
+    Poisson/Dixon-Coles outcome probabilities from TeamState ratings.
+
+    predict() answers one fixture; predict_ratings() takes rating arrays
+    and answers any number of fixtures in a few vectorized passes.
+    """
+
+    def __init__(self, coefficients: Sequence[float], rho: float = 0.0,
+                 report: Optional[CalibrationReport] = None):
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.rho = rho
+        self.report = report
+
+    @classmethod
+    def load(cls, path=DEFAULT_CALIBRATION) -> "RatingPredictor":
+        data = json.loads(Path(path).read_text())
+        if data.get("version") != CALIBRATION_VERSION or data.get("features") != FEATURES:
+            raise ValueError(f"{path} is not a version {CALIBRATION_VERSION} predictor calibration")
+        report = data.get("calibration")
+        if report is not None:
+            report["reliability"] = [tuple(row) for row in report["reliability"]]
+            report = CalibrationReport(**report)
+        return cls(data["coefficients"], data["rho"], report)
+
+    def save(self, path=DEFAULT_CALIBRATION):
+        data = {
+            "version": CALIBRATION_VERSION,
+            "features": FEATURES,
+            "coefficients": [round(float(c), 6) for c in self.coefficients],
+            "rho": round(self.rho, 6),
+            "calibration": asdict(self.report) if self.report is not None else None,
+        }
+        Path(path).write_text(json.dumps(data, indent=2) + "\n")
+
+    def goal_rates(self, home_attack, home_defense, home_midfield,
+                   away_attack, away_defense, away_midfield) -> Tuple[np.ndarray, np.ndarray]:
+        """Expected (home, away) goals for rating arrays"""
+        home_rate = np.exp(_features(home_attack, home_midfield, away_defense, away_midfield, True)
+                           @ self.coefficients)
+        away_rate = np.exp(_features(away_attack, away_midfield, home_defense, home_midfield, False)
+                           @ self.coefficients)
+        return home_rate, away_rate
+
+    def predict_ratings(self, home_attack, home_defense, home_midfield,
+                        away_attack, away_defense, away_midfield) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(home win, draw, away win) probabilities for rating arrays"""
+        home_rate, away_rate = self.goal_rates(home_attack, home_defense, home_midfield,
+                                               away_attack, away_defense, away_midfield)
+        home_pmf, away_pmf = _poisson_pmf(home_rate), _poisson_pmf(away_rate)
+        away_below = np.cumsum(away_pmf, axis=-1) - away_pmf  # P(away scores < k)
+
+        home_win = (home_pmf * away_below).sum(axis=-1)
+        draw = (home_pmf * away_pmf).sum(axis=-1)
+        away_win = (away_pmf * (np.cumsum(home_pmf, axis=-1) - home_pmf)).sum(axis=-1)
+
+        # Dixon-Coles: shift mass between 0-0, 1-0, 0-1 and 1-1
+        if self.rho:
+            p00 = home_pmf[..., 0] * away_pmf[..., 0]
+            p10 = home_pmf[..., 1] * away_pmf[..., 0]
+            p01 = home_pmf[..., 0] * away_pmf[..., 1]
+            p11 = home_pmf[..., 1] * away_pmf[..., 1]
+            draw = draw - p00 * home_rate * away_rate * self.rho - p11 * self.rho
+            home_win = home_win + p10 * away_rate * self.rho
+            away_win = away_win + p01 * home_rate * self.rho
+
+        total = home_win + draw + away_win
+        return home_win / total, draw / total, away_win / total
+
+    def predict(self, home: TeamState, away: TeamState) -> Tuple[float, float, float]:
+        home_win, draw, away_win = self.predict_ratings(
+            home.attack_rating, home.defense_rating, home.midfield_rating,
+            away.attack_rating, away.defense_rating, away.midfield_rating)
+        return float(home_win), float(draw), float(away_win)
+
+
+def _ratings(teams: Sequence[TeamState]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return (np.array([t.attack_rating for t in teams]), np.array([t.defense_rating for t in teams]),
+            np.array([t.midfield_rating for t in teams]))
+
+
+def fit(fixtures: Sequence[Tuple[TeamState, TeamState]], samples: int = 2000,
+        seed: Optional[int] = None, iterations: int = 25) -> RatingPredictor:
+    """Fit the predictor by Poisson regression on batch engine results"""
+    homes, aways = [h for h, _ in fixtures], [a for _, a in fixtures]
+    result = BatchMatchSimulator(seed=seed).simulate_fixtures(fixtures, samples)
+
+    home_atk, home_def, home_mid = _ratings(homes)
+    away_atk, away_def, away_mid = _ratings(aways)
+    x = np.concatenate([_features(home_atk, home_mid, away_def, away_mid, True),
+                        _features(away_atk, away_mid, home_def, home_mid, False)])
+    y = np.concatenate([result.home_score.mean(axis=-1), result.away_score.mean(axis=-1)])
+
+    # IRLS on per-fixture mean goals (each row stands for `samples` matches)
+    beta = np.zeros(x.shape[1])
+    beta[0] = math.log(max(y.mean(), 1e-6))
+    for _ in range(iterations):
+        rate = np.exp(x @ beta)
+        z = x @ beta + (y - rate) / rate
+        weighted = x * rate[:, None]
+        step = np.linalg.solve(x.T @ weighted, weighted.T @ z)
+        if np.max(np.abs(step - beta)) < 1e-10:
+            beta = step
+            break
+        beta = step
+
+    # Dixon-Coles rho by maximum likelihood (golden-section search)
+    home_rate, away_rate = np.exp(x[:len(fixtures)] @ beta), np.exp(x[len(fixtures):] @ beta)
+    home_goals, away_goals = result.home_score, result.away_score
+    low = (home_goals <= 1) & (away_goals <= 1)
+
+    def log_likelihood(rho: float) -> float:
+        tau = _dixon_coles_tau(home_goals, away_goals, home_rate[:, None], away_rate[:, None], rho)
+        return float(np.log(np.maximum(tau[low], 1e-12)).sum())
+
+    limit = 1 / max(float(np.max(home_rate * away_rate)), 1.0)
+    lo, hi = -limit, limit
+    ratio = (math.sqrt(5) - 1) / 2
+    for _ in range(60):
+        a, b = hi - ratio * (hi - lo), lo + ratio * (hi - lo)
+        if log_likelihood(a) >= log_likelihood(b):
+            hi = b
+        else:
+            lo = a
+    return RatingPredictor(beta, (lo + hi) / 2)
+
+
+def calibrate(predictor: RatingPredictor, fixtures: Sequence[Tuple[TeamState, TeamState]],
+              samples: int = 2000, seed: Optional[int] = None, bins: int = 10) -> CalibrationReport:
+    """Compare predictions with the exact engine distribution and with sampled engine results"""
+    homes, aways = [h for h, _ in fixtures], [a for _, a in fixtures]
+    predicted = np.stack(predictor.predict_ratings(*_ratings(homes), *_ratings(aways)), axis=-1)
+    home_rate, away_rate = predictor.goal_rates(*_ratings(homes), *_ratings(aways))
+
+    dists = [outcome_distribution(h, a) for h, a in fixtures]
+    exact = np.array([[d.home_win, d.draw, d.away_win] for d in dists])
+    exact_rates = np.array([[d.home_xg, d.away_xg] for d in dists])
+
+    result = BatchMatchSimulator(seed=seed).simulate_fixtures(fixtures, samples)
+    observed = np.stack([(result.home_score > result.away_score).mean(axis=-1),
+                         (result.home_score == result.away_score).mean(axis=-1),
+                         (result.home_score < result.away_score).mean(axis=-1)], axis=-1)
+
+    def brier(probs: np.ndarray) -> float:
+        # Expected squared error over each fixture's sampled outcomes
+        return float(((probs ** 2).sum(axis=-1) - 2 * (probs * observed).sum(axis=-1) + 1).mean())
+
+    reliability = []
+    edges = np.linspace(0, 1, bins + 1)
+    which = np.clip(np.digitize(predicted[:, 0], edges) - 1, 0, bins - 1)
+    for b in range(bins):
+        mask = which == b
+        if mask.any():
+            reliability.append((round(float(predicted[mask, 0].mean()), 4),
+                                round(float(observed[mask, 0].mean()), 4), int(mask.sum())))
+
+    error = np.abs(predicted - exact)
+    return CalibrationReport(
+        fixtures=len(fixtures),
+        samples=samples,
+        outcome_mae=round(float(error.mean()), 5),
+        outcome_max_error=round(float(error.max()), 5),
+        goal_rate_mae=round(float(np.abs(np.stack([home_rate, away_rate], axis=-1) - exact_rates).mean()), 5),
+        brier=round(brier(predicted), 5),
+        engine_brier=round(brier(exact), 5),
+        reliability=reliability
+    )
+
+
+def sample_fixtures(count: int, seed: int = 0) -> List[Tuple[TeamState, TeamState]]:
+    """Fixtures over a wide spread of team strengths and tactics"""
+    rng = random.Random(seed)
+
+    def team(name: str) -> TeamState:
+        tactics = Tactics(rng.choice(list(FORMATIONS)), rng.randint(1, 10), rng.randint(1, 10),
+                          rng.randint(1, 10), rng.choice(list(PlayStyle)))
+        players = create_sample_team(name, rng.randint(60, 92), rng=rng).players
+        return TeamState(name=name, players=players, tactics=tactics)
+
+    return [(team(f"Home {i}"), team(f"Away {i}")) for i in range(count)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Fit or check the rating-based match predictor")
+    parser.add_argument("--fit", action="store_true", help="refit on fresh engine output and save")
+    parser.add_argument("--fixtures", type=int, default=500)
+    parser.add_argument("--samples", type=int, default=2000, help="engine replays per fixture")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=str(DEFAULT_CALIBRATION), help="calibration file")
+    args = parser.parse_args(argv)
+
+    if args.fit:
+        predictor = fit(sample_fixtures(args.fixtures, args.seed), args.samples, args.seed)
+    else:
+        predictor = RatingPredictor.load(args.output)
+
+    # Held-out fixtures for the report
+    holdout = sample_fixtures(args.fixtures, args.seed + 1)
+    predictor.report = calibrate(predictor, holdout, args.samples, args.seed + 1)
+    predictor.report.print_summary()
+
+    if args.fit:
+        predictor.save(args.output)
+        print(f"📄 Saved calibration to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
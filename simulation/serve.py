@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Moltball Simulation Service
+
+A long-running asyncio server so callers (e.g. the TypeScript API) share one
+warm engine instead of starting Python per match. Clients send one JSON
+request per line over a Unix socket or TCP and get JSON lines back, tagged
+with the request's "id"; the last line for a request has "done": true.
+
+Request types:
+    {"id": 1, "type": "fixture", "home": TEAM, "away": TEAM, "seed": 7, "detail_level": "summary"}
+    {"id": 2, "type": "distribution", "home": TEAM, "away": TEAM, "samples": 10000, "seed": 7}
+    {"id": 3, "type": "forecast", "teams": [TEAM, ...], "seasons": 10000, "seed": 7}
+    {"id": 4, "type": "live", "home": TEAM, "away": TEAM, "seed": 7, "interval": 10}
+
+TEAM is {"name": ..., "players": [{"player_name", "position", "overall", "pace",
+"shooting", "passing", "dribbling", "defense", "physical", ...}], "tactics":
+{"formation", "attacking_intensity", "defensive_line", "pressing_intensity",
+"play_style"}}, with play_style given by name (e.g. "HIGH_PRESS").
+
+Fixtures and forecast chunks run on a process pool. Identical requests that
+arrive while one is in flight (same teams, tactics and seed) share its job
+and all receive the same stream. Forecasts stream cumulative standings
+after every finished chunk. Live matches are played period by period on
+the event loop itself, with "interval" seconds between periods, and
+stream each period's totals and new events; a live match with many
+viewers is simulated once for all of them. Distributions are exact
+unless "samples" is given; seeded sampled ones are answered from a
+ForecastCache (optionally sqlite-backed).
+
+Usage: python -m simulation.serve [--socket PATH | --port N] [--workers N] [--cache PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional
+
+import numpy as np
+
+from .cache import ForecastCache, fixture_key, sampled_distribution
+from .engine import (DETAIL_LEVELS, MatchSimulator, PlayerStats, PlayStyle, Tactics, TeamState,
+                     _play_fixture, outcome_distribution)
+from .forecast import SeasonForecast, _simulate_seasons
+
+DEFAULT_SOCKET = "/tmp/moltball-sim.sock"
+FORECAST_CHUNK = 500
+
+_PLAYER_FIELDS = {f.name for f in fields(PlayerStats)}
+
+
+@lru_cache(maxsize=256)
+def _parse_team(spec: str) -> TeamState:
+    """TeamState from its canonical JSON; cached so repeat teams skip lineup solving"""
+    data = json.loads(spec)
+    name = data["name"]
+    players = [PlayerStats(**{"season": "", "club": name,
+                              **{k: v for k, v in p.items() if k in _PLAYER_FIELDS}})
+               for p in data["players"]]
+    tactics = dict(data.get("tactics", {}))
+    if "play_style" in tactics:
+        tactics["play_style"] = PlayStyle[tactics["play_style"]]
+    return TeamState(name=name, players=players, tactics=Tactics(**tactics))
+
+
+def _canonical(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def team_from_json(data: dict) -> TeamState:
+    return _parse_team(_canonical(data))
+
+
+def _result_to_json(result) -> dict:
+    data = result._asdict() if hasattr(result, "_asdict") else vars(result)
+    return {k: [asdict(e) for e in v] if k == "events" else list(v) if isinstance(v, tuple) else v
+            for k, v in data.items()}
+
+
+class _Job:
+    """Messages of one (possibly shared) request, replayable by late subscribers"""
+
+    def __init__(self):
+        self.messages: List[dict] = []
+        self.done = False
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Condition()
+
+    async def publish(self, message: dict, done: bool = False):
+        async with self._changed:
+            self.messages.append(message)
+            self.done = done
+            self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[dict]:
+        seen = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: len(self.messages) > seen)
+                pending = self.messages[seen:]
+                finished = self.done
+            seen += len(pending)
+            for message in pending:
+                yield message
+            if finished and seen == len(self.messages):
+                return
+
+
+class SimulationService:
+    """Request handling, coalescing and the worker pool, independent of transport"""
+
+    def __init__(self, workers: Optional[int] = None, cache: Optional[ForecastCache] = None):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.cache = cache if cache is not None else ForecastCache()
+        self.in_flight: Dict[str, _Job] = {}
+        self.coalesced = 0
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        self.cache.close()
+
+    async def handle(self, request: dict) -> AsyncIterator[dict]:
+        """Response messages for one request (without the "id" tag)"""
+        request = {k: v for k, v in request.items() if k != "id"}
+        kind = request.get("type")
+        run = {"fixture": self._fixture, "distribution": self._distribution,
+               "forecast": self._forecast, "live": self._live}.get(kind)
+        if run is None:
+            yield {"error": f"unknown request type {kind!r}", "done": True}
+            return
+
+        # Unseeded runs are meant to differ, so never share them
+        if kind != "distribution" and request.get("seed") is None:
+            request["seed"] = random.getrandbits(63)
+            key = None
+        elif kind == "distribution" and "samples" in request and request.get("seed") is None:
+            key = None
+        else:
+            key = _canonical(request)
+
+        job = self.in_flight.get(key) if key is not None else None
+        if job is not None:
+            self.coalesced += 1
+        else:
+            job = _Job()
+            if key is not None:
+                self.in_flight[key] = job
+            job.task = asyncio.get_running_loop().create_task(self._run(run, request, job, key))
+
+        job.subscribers += 1
+        try:
+            async for message in job.subscribe():
+                yield message
+        finally:
+            job.subscribers -= 1
+            if not job.subscribers and not job.done:
+                # Nobody is left to receive it (e.g. every live viewer disconnected)
+                job.task.cancel()
+                if key is not None and self.in_flight.get(key) is job:
+                    del self.in_flight[key]
+
+    async def _run(self, run, request: dict, job: _Job, key: Optional[str]):
+        try:
+            last = None
+            async for message in run(request):
+                if "done" in message:
+                    # Streams that mark their own last message aren't held back a message
+                    await job.publish(message, done=message["done"])
+                    if message["done"]:
+                        return
+                    continue
+                if last is not None:
+                    await job.publish(last)
+                last = message
+            await job.publish({**(last or {}), "done": True}, done=True)
+        except Exception as exc:
+            await job.publish({"error": f"{type(exc).__name__}: {exc}", "done": True}, done=True)
+        finally:
+            if key is not None and self.in_flight.get(key) is job:
+                del self.in_flight[key]
+
+    async def _fixture(self, request: dict) -> AsyncIterator[dict]:
+        home, away = team_from_json(request["home"]), team_from_json(request["away"])
+        detail_level = request.get("detail_level", "summary")
+        if detail_level not in DETAIL_LEVELS:
+            raise ValueError(f"detail_level must be one of {DETAIL_LEVELS}, got {detail_level!r}")
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self.pool, _play_fixture, home, away,
+                                            str(request["seed"]), detail_level)
+        yield {"seed": request["seed"], "result": _result_to_json(result)}
+
+    async def _distribution(self, request: dict) -> AsyncIterator[dict]:
+        home, away = team_from_json(request["home"]), team_from_json(request["away"])
+        samples, seed = request.get("samples"), request.get("seed")
+        if samples is None:
+            # Exact and cheaper to compute on the event loop than to look up
+            dist = outcome_distribution(home, away)
+        else:
+            # Sample on the pool; the cache itself is only touched from the loop
+            samples = int(samples)
+            if samples <= 0:
+                raise ValueError(f"samples must be positive, got {samples}")
+            key = fixture_key(home, away, samples, seed) if seed is not None else None
+            dist = self.cache.get(key) if key is not None else None
+            if dist is None:
+                loop = asyncio.get_running_loop()
+                dist = await loop.run_in_executor(self.pool, sampled_distribution, home, away, samples, seed)
+                if key is not None:
+                    self.cache.misses += 1
+                    self.cache.put(key, dist)
+        yield {"distribution": asdict(dist)}
+
+    async def _forecast(self, request: dict) -> AsyncIterator[dict]:
+        teams = [team_from_json(t) for t in request["teams"]]
+        seasons = int(request["seasons"])
+        chunk_size = int(request.get("chunk_size", FORECAST_CHUNK))
+        if seasons <= 0 or chunk_size <= 0:
+            raise ValueError(f"seasons and chunk_size must be positive, got {seasons} and {chunk_size}")
+        chunks = [min(chunk_size, seasons - start) for start in range(0, seasons, chunk_size)]
+        # Same chunking and seeds as ParallelSeasonRunner, so results match it
+        seeds = np.random.SeedSequence(request["seed"]).spawn(len(chunks))
+
+        loop = asyncio.get_running_loop()
+
+        async def run_chunk(seed: np.random.SeedSequence, n: int):
+            return n, await loop.run_in_executor(self.pool, _simulate_seasons, teams, seed, n)
+
+        counts = np.zeros((len(teams), len(teams)), dtype=np.int64)
+        total_points = np.zeros(len(teams), dtype=np.int64)
+        done = 0
+        for future in asyncio.as_completed([run_chunk(s, n) for s, n in zip(seeds, chunks)]):
+            n, (chunk_counts, chunk_points) = await future
+            counts += chunk_counts
+            total_points += chunk_points
+            done += n
+            forecast = SeasonForecast([t.name for t in teams], done, counts, total_points)
+            yield {"seed": request["seed"], "seasons": done, "of": seasons, "summary": forecast.summary()}
+
+    async def _live(self, request: dict) -> AsyncIterator[dict]:
+        home, away = team_from_json(request["home"]), team_from_json(request["away"])
+        interval = float(request.get("interval", 0))
+        sim = MatchSimulator(home, away, rng=random.Random(str(request["seed"])))
+        updates = sim.simulate_stream(detail_level=request.get("detail_level", "full"))
+        final = MatchSimulator.PERIOD_MINUTES[-1]
+        try:
+            for update in updates:
+                yield {"seed": request["seed"], "update": _result_to_json(update), "done": update.minute == final}
+                # Always yield to the loop so thousands of live matches interleave
+                await asyncio.sleep(interval)
+        finally:
+            updates.close()
+
+
+async def _serve_connection(service: SimulationService, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter):
+    lock = asyncio.Lock()
+    tasks = set()
+
+    async def send(message: dict):
+        async with lock:
+            writer.write((json.dumps(message) + "\n").encode())
+            await writer.drain()
+
+    async def respond(request: dict):
+        messages = service.handle(request)
+        try:
+            async for message in messages:
+                await send({"id": request.get("id"), **message})
+        finally:
+            await messages.aclose()
+
+    try:
+        while line := await reader.readline():
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as exc:
+                await send({"id": None, "error": f"invalid JSON: {exc}", "done": True})
+                continue
+            if not isinstance(request, dict):
+                await send({"id": None, "error": "request must be a JSON object", "done": True})
+                continue
+            task = asyncio.create_task(respond(request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    except ConnectionError:
+        pass  # The client went away mid-response
+    finally:
+        # A dropped connection stops its responses, and with them any job no one else follows
+        for task in tasks:
+            task.cancel()
+        writer.close()
+
+
+async def serve(socket_path: Optional[str] = DEFAULT_SOCKET, port: Optional[int] = None,
+                host: str = "127.0.0.1", workers: Optional[int] = None, cache_path: Optional[str] = None):
+    service = SimulationService(workers, ForecastCache(path=cache_path))
+
+    def handler(reader, writer):
+        return _serve_connection(service, reader, writer)
+
+    if port is not None:
+        server = await asyncio.start_server(handler, host, port)
+        where = f"{host}:{port}"
+    else:
+        server = await asyncio.start_unix_server(handler, socket_path)
+        where = socket_path
+    print(f"⚽ Simulation service listening on {where}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve match simulations over a local socket")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--port", type=int, help="listen on TCP instead of a Unix socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--workers", type=int, help="simulation worker processes")
+    parser.add_argument("--cache", help="sqlite file backing the distribution cache")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.socket, args.port, args.host, args.workers, args.cache))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
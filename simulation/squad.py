@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Moltball Squad Builder
+
+Picks the starting XI for a formation that maximises total position fit
+(the score TeamState's lineup selection maximises) without spending more
+than a $BALL budget. Prices come from calculate_price in
+scripts/fetch-eafc25-players.py, so they match the seeded players table.
+
+The search is a branch and bound over formation slots. Per-slot candidate
+indexes are built once per player pool; a player is dropped from a slot's
+index when at least a full XI of others fit the slot as well for no more
+money, since an optimal lineup never needs them. Nodes are bounded by a
+knapsack over the budget that ignores only the distinct-players constraint,
+and a current squad can be given as a warm start so suggestions only change
+the lineup where it strictly helps.
+"""
+
+import importlib.util
+import math
+import time
+from bisect import bisect_right, insort
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .engine import FORMATIONS, PlayerStats, Tactics, TeamState, _position_fit, _solve_lineup
+
+SEED_SCRIPT = Path(__file__).parent.parent / "scripts" / "fetch-eafc25-players.py"
+
+LINEUP_SIZE = 11
+
+
+@lru_cache(maxsize=1)
+def _seed_script():
+    spec = importlib.util.spec_from_file_location("fetch_eafc25_players", SEED_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def player_price(overall: int) -> int:
+    """$BALL price of a player, as seeded into the players table"""
+    return _seed_script().calculate_price(overall)
+
+
+@dataclass
+class SquadSelection:
+    formation: str
+    lineup: List[Tuple[str, int]]  # (slot position, pool index) in formation order
+    total_fit: float
+    cost: int
+    transfers_in: List[int]  # Pool indices not in the current squad
+    transfers_out: List[int]  # Current squad indices left out of the lineup
+    optimal: bool  # False when the node limit stopped the search early
+    nodes: int
+    seconds: float
+
+
+class SquadOptimizer:
+    """
+    Budget-constrained lineup selection over a player pool.
+
+    players can be PlayerStats or PlayerTable rows; prices default to
+    calculate_price of each player's overall rating.
+    """
+
+    def __init__(self, players: Sequence[PlayerStats], prices: Optional[Sequence[int]] = None):
+        self.players = list(players)
+        self.prices = list(prices) if prices is not None else [player_price(p.overall) for p in self.players]
+        self._fits: Dict[str, List[float]] = {}
+        self._index: Dict[str, List[int]] = {}
+
+    def fits(self, position: str) -> List[float]:
+        """Position fit of every pool player for a slot"""
+        fits = self._fits.get(position)
+        if fits is None:
+            fits = self._fits[position] = [_position_fit(p.position, p.overall, position) for p in self.players]
+        return fits
+
+    def slot_candidates(self, position: str) -> List[int]:
+        """
+        Pool indices worth considering for a slot, best fit first.
+
+        A player is left out when LINEUP_SIZE others fit at least as well
+        for no more money: whatever else the lineup uses, one of them is
+        free to take the slot instead.
+        """
+        index = self._index.get(position)
+        if index is None:
+            fits, prices = self.fits(position), self.prices
+            order = sorted(range(len(self.players)), key=lambda i: (-fits[i], prices[i]))
+            seen_prices: List[int] = []
+            index = []
+            for i in order:
+                if bisect_right(seen_prices, prices[i]) < LINEUP_SIZE:
+                    index.append(i)
+                insort(seen_prices, prices[i])
+            self._index[position] = index
+        return index
+
+    def optimize(self, budget: int, formation: str = "4-4-2", current: Sequence[int] = (),
+                 max_transfers: Optional[int] = None, max_nodes: Optional[int] = None) -> SquadSelection:
+        """
+        Strongest affordable lineup for formation.
+
+        current is the squad as pool indices; its best affordable lineup is
+        the starting incumbent and its players count as free of transfers,
+        so only strict improvements replace them. max_transfers caps the
+        number of newcomers; max_nodes caps the search for per-tick use.
+        """
+        start = time.perf_counter()
+        positions = FORMATIONS[formation]
+        owned = set(current)
+        prices = self.prices
+
+        # Owned players are always candidates, dominated or not
+        slots = []
+        for slot, position in enumerate(positions):
+            candidates = set(self.slot_candidates(position)) | owned
+            slots.append((slot, self.fits(position), list(candidates)))
+        # Most constrained slots first, with repeated positions kept together
+        slots.sort(key=lambda s: (len(s[2]), positions[s[0]]))
+        n = len(slots)
+
+        # Players with the same position, rating, price and ownership are
+        # interchangeable; only the first free one of each kind is branched on
+        kind = {i: (self.players[i].position, self.players[i].overall, prices[i], i in owned)
+                for _, _, candidates in slots for i in candidates}
+        for _, fits, candidates in slots:
+            candidates.sort(key=lambda i: (-fits[i], prices[i], kind[i]))
+        # Repeated positions take their picks in candidate order, so each set is tried once
+        repeat = [d > 0 and positions[slots[d][0]] == positions[slots[d - 1][0]] for d in range(n)]
+
+        step, upper = _budget_bounds(slots, positions, prices, budget)
+
+        incumbent = self._warm_start(positions, list(current), budget)
+        best = {"fit": incumbent[0], "picks": incumbent[1]} if incumbent else {"fit": float("-inf"), "picks": None}
+        picks = [0] * len(positions)
+        ranks = [0] * n
+        used = set()
+        nodes = 0
+        complete = True
+
+        def search(depth: int, fit: float, spent: int, transfers: int):
+            nonlocal nodes, complete
+            if depth == n:
+                if fit > best["fit"]:
+                    best["fit"], best["picks"] = fit, list(picks)
+                return
+            if max_nodes is not None and nodes >= max_nodes:
+                complete = False
+                return
+            nodes += 1
+
+            slot, fits, candidates = slots[depth]
+            later = upper[depth + 1]
+            children = []
+            tried = set()
+            for rank in range(ranks[depth - 1] + 1 if repeat[depth] else 0, len(candidates)):
+                i = candidates[rank]
+                if i in used or kind[i] in tried:
+                    continue
+                tried.add(kind[i])
+                new_transfer = i not in owned
+                if new_transfer and max_transfers is not None and transfers >= max_transfers:
+                    continue
+                left = budget - spent - prices[i]
+                if left >= 0:
+                    children.append((fit + fits[i] + later[left // step], rank, i, new_transfer))
+
+            # Most promising first; fits are integers, so a bound below
+            # best + 1 can't strictly improve on the incumbent
+            children.sort(key=lambda child: -child[0])
+            for bound, rank, i, new_transfer in children:
+                if bound < best["fit"] + 1 - 1e-9:
+                    break
+                used.add(i)
+                picks[slot] = i
+                ranks[depth] = rank
+                search(depth + 1, fit + fits[i], spent + prices[i], transfers + new_transfer)
+                used.discard(i)
+
+        search(0, 0.0, 0, 0)
+
+        if best["picks"] is None:
+            raise ValueError(f"no {formation} lineup fits a budget of {budget}")
+        lineup = best["picks"]
+        chosen = set(lineup)
+        return SquadSelection(
+            formation=formation,
+            lineup=list(zip(positions, lineup)),
+            total_fit=best["fit"],
+            cost=sum(prices[i] for i in lineup),
+            transfers_in=[i for i in lineup if i not in owned],
+            transfers_out=[i for i in current if i not in chosen],
+            optimal=complete,
+            nodes=nodes,
+            seconds=time.perf_counter() - start
+        )
+
+    def team(self, name: str, selection: SquadSelection, tactics: Optional[Tactics] = None) -> TeamState:
+        return TeamState(name=name, players=[self.players[i] for _, i in selection.lineup],
+                         tactics=tactics if tactics is not None else Tactics(selection.formation))
+
+    def _warm_start(self, positions: List[str], current: List[int],
+                    budget: int) -> Optional[Tuple[float, List[int]]]:
+        """Best lineup of the current squad, if it fills the formation within budget"""
+        if len(current) < len(positions):
+            return None
+        squad_key = tuple((self.players[i].position, self.players[i].overall) for i in current)
+        lineup = [current[k] for k in _solve_lineup(squad_key, tuple(positions))]
+        if sum(self.prices[i] for i in lineup) > budget:
+            return None
+        fit = sum(self.fits(position)[i] for position, i in zip(positions, lineup))
+        return fit, lineup
+
+
+def _budget_bounds(slots, positions: Sequence[str], prices: Sequence[int], budget: int,
+                   max_steps: int = 4096) -> Tuple[int, List[List[float]]]:
+    """
+    (step, upper) where upper[d][b // step] bounds the fit the slots from
+    depth d on can add with b $BALL left, -inf when they can't be filled.
+
+    A knapsack over the budget in which each run of repeated positions
+    picks distinct players but different positions may share one; that is
+    the only constraint relaxed. Prices and budgets are floored to
+    multiples of step (kept to at most max_steps of them); the floors of
+    affordable prices sum to at most the floor of the budget, so the bound
+    stays valid.
+    """
+    step = max(1, math.gcd(budget, *prices), -(-budget // max_steps))
+    size = budget // step + 1
+    upper = [np.zeros(size)]
+
+    end = len(slots)
+    while end > 0:
+        start = end - 1
+        while start > 0 and positions[slots[start - 1][0]] == positions[slots[end - 1][0]]:
+            start -= 1
+        count = end - start
+        _, fits, candidates = slots[start]
+
+        # Only the count best fits at each floored price can matter, and only
+        # while fewer than count cheaper options fit at least as well
+        by_cost: Dict[int, List[float]] = {}
+        for i in candidates:
+            if prices[i] // step < size:
+                by_cost.setdefault(prices[i] // step, []).append(fits[i])
+        options = []
+        better: List[float] = []
+        for cost in sorted(by_cost):
+            top = sorted(by_cost[cost], reverse=True)[:count]
+            options.extend((cost, fit) for fit in top
+                           if sum(f >= fit for f in better) < count)
+            better = sorted(better + top, reverse=True)[:count]
+
+        # best[j]: j group picks so far plus everything after the group
+        best = [upper[-1]] + [np.full(size, -np.inf) for _ in range(count)]
+        for cost, fit in options:
+            for j in range(count, 0, -1):
+                np.maximum(best[j][cost:], best[j - 1][:size - cost] + fit, out=best[j][cost:])
+        upper.extend(best[1:])
+        end = start
+
+    return step, [table.tolist() for table in reversed(upper)]
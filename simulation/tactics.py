@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Moltball Tactics Optimizer
+
+Searches formations, play styles and slider settings for the best response
+to a given opponent. Lineup ratings are computed once per formation; each
+candidate only re-applies the tactical modifiers to a shallow copy of that
+team and shares its SimProfile (which does not depend on tactics), so
+candidates cost microseconds to build.
+
+Candidates are scored on expected points, either exactly with
+outcome_distribution or sampled with the batch engine under successive
+halving: every survivor is sampled, the best 1/eta go through to the next
+rung with eta times the samples, and the finalists are re-scored exactly.
+"""
+
+import copy
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import BatchMatchSimulator
+from .engine import FORMATIONS, PlayStyle, Tactics, TeamState, outcome_distribution
+
+EVALUATORS = ("analytic", "batch")
+
+# formation -> (team in that formation, lineup ratings before tactics)
+FormationBases = Dict[str, Tuple[TeamState, Tuple[float, float, float]]]
+# (expected points, expected goal difference)
+Score = Tuple[float, float]
+
+
+def formation_bases(team: TeamState, formations: Iterable[str]) -> FormationBases:
+    bases = {}
+    for formation in formations:
+        base = TeamState(name=team.name, players=team.players, tactics=Tactics(formation))
+        base._sim_profile = team.sim_profile
+        bases[formation] = (base, base._lineup_ratings())
+    return bases
+
+
+def candidate_team(bases: FormationBases, tactics: Tactics) -> TeamState:
+    """The team under tactics, without re-solving its lineup or profile"""
+    base, (attack, defense, midfield) = bases[tactics.formation]
+    team = copy.copy(base)
+    team.tactics = tactics
+    team.attack_rating, team.defense_rating, team.midfield_rating = attack, defense, midfield
+    team._apply_tactical_modifiers()
+    team._sim_profile = base.sim_profile
+    return team
+
+
+def score_candidates(bases: FormationBases, opponent: TeamState, home: bool, candidates: Sequence[Tactics],
+                     samples: Optional[int] = None, seed=None) -> List[Score]:
+    """Expected points and goal difference per candidate; exact when samples is None"""
+    sim = BatchMatchSimulator(rng=np.random.default_rng(seed)) if samples is not None else None
+    scores = []
+    for tactics in candidates:
+        team = candidate_team(bases, tactics)
+        home_team, away_team = (team, opponent) if home else (opponent, team)
+        if sim is None:
+            dist = outcome_distribution(home_team, away_team)
+            win = dist.home_win if home else dist.away_win
+            gd = (dist.home_xg - dist.away_xg) * (1 if home else -1)
+            scores.append((3 * win + dist.draw, gd))
+        else:
+            result = sim.simulate(home_team, away_team, samples)
+            gf, ga = (result.home_score, result.away_score) if home else (result.away_score, result.home_score)
+            scores.append((float(3 * (gf > ga).mean() + (gf == ga).mean()), float((gf - ga).mean())))
+    return scores
+
+
+# Teams are sent to each worker once, via the pool initializer
+_worker_context: tuple = ()
+
+
+def _init_worker(team: TeamState, opponent: TeamState, home: bool, formations: List[str]):
+    global _worker_context
+    _worker_context = (formation_bases(team, formations), opponent, home)
+
+
+def _score_chunk(candidates: List[Tactics], samples: Optional[int], seed) -> List[Score]:
+    bases, opponent, home = _worker_context
+    return score_candidates(bases, opponent, home, candidates, samples, seed)
+
+
+@dataclass
+class TacticsSearch:
+    tactics: Tactics
+    expected_points: float
+    goal_difference: float
+    ranking: List[Tuple[Tactics, float]]  # Finalists by exact expected points, best first
+    candidates: int
+    rungs: int
+    seconds: float
+
+
+class TacticsOptimizer:
+    """
+    Best-response tactics for one team against a fixed opponent.
+
+    The engine does not read defensive_line, so it is held at the team's
+    current value rather than searched. With workers > 1 each rung is split
+    into fixed-size chunks over a process pool; chunk seeds come from one
+    root SeedSequence, so a given seed gives the same search regardless of
+    worker count.
+    """
+
+    def __init__(self, team: TeamState, opponent: TeamState, home: bool = True,
+                 evaluator: str = "analytic", min_samples: int = 64, eta: int = 3, finalists: int = 5,
+                 workers: int = 1, chunk_size: int = 250, seed: Optional[int] = None,
+                 formations: Optional[Sequence[str]] = None, play_styles: Optional[Sequence[PlayStyle]] = None,
+                 intensities: Sequence[int] = range(1, 11)):
+        if evaluator not in EVALUATORS:
+            raise ValueError(f"evaluator must be one of {EVALUATORS}, got {evaluator!r}")
+        self.team = team
+        self.opponent = opponent
+        self.home = home
+        self.evaluator = evaluator
+        self.min_samples = min_samples
+        self.eta = eta
+        self.finalists = finalists
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.formations = list(formations) if formations is not None else list(FORMATIONS)
+        self.play_styles = list(play_styles) if play_styles is not None else list(PlayStyle)
+        self.intensities = list(intensities)
+
+    def candidates(self) -> List[Tactics]:
+        defensive_line = self.team.tactics.defensive_line
+        return [
+            Tactics(formation, attacking, defensive_line, pressing, style)
+            for formation in self.formations
+            for style in self.play_styles
+            for attacking in self.intensities
+            for pressing in self.intensities
+        ]
+
+    def optimize(self) -> TacticsSearch:
+        start = time.perf_counter()
+        survivors = self.candidates()
+        total = len(survivors)
+        bases = formation_bases(self.team, self.formations)
+        root = np.random.SeedSequence(self.seed)
+
+        pool = None
+        if self.workers > 1 and total > self.chunk_size:
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                       initargs=(self.team, self.opponent, self.home, self.formations))
+
+        rungs = 0
+        samples = None if self.evaluator == "analytic" else self.min_samples
+        try:
+            while True:
+                rungs += 1
+                chunks = [survivors[i:i + self.chunk_size] for i in range(0, len(survivors), self.chunk_size)]
+                seeds = root.spawn(len(chunks))
+                if pool is not None and len(chunks) > 1:
+                    partials = pool.map(_score_chunk, chunks, [samples] * len(chunks), seeds)
+                else:
+                    partials = (score_candidates(bases, self.opponent, self.home, chunk, samples, s)
+                                for chunk, s in zip(chunks, seeds))
+                scores = [score for partial in partials for score in partial]
+
+                order = sorted(range(len(survivors)), key=lambda i: scores[i], reverse=True)
+                survivors = [survivors[i] for i in order]
+                # Exact scores need no further rungs
+                if samples is None or len(survivors) <= self.finalists:
+                    break
+                survivors = survivors[:max(self.finalists, math.ceil(len(survivors) / self.eta))]
+                samples *= self.eta
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        finalists = survivors[:self.finalists]
+        exact = score_candidates(bases, self.opponent, self.home, finalists)
+        ranked = sorted(zip(finalists, exact), key=lambda pair: pair[1], reverse=True)
+        best, (points, gd) = ranked[0]
+
+        return TacticsSearch(
+            tactics=best,
+            expected_points=points,
+            goal_difference=gd,
+            ranking=[(tactics, score[0]) for tactics, score in ranked],
+            candidates=total,
+            rungs=rungs,
+            seconds=time.perf_counter() - start
+        )
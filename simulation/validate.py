@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Moltball Engine Validation
+
+Checks that an optimized engine reproduces the reference MatchSimulator's
+distributions. Both engines play the same TeamState fixtures; goals, shots
+and shots on target are compared with chi-square homogeneity tests and xG
+with a two-sample Kolmogorov-Smirnov test. The analytic engine is checked
+with a chi-square goodness-of-fit test of reference goals against its exact
+pmfs. Mismatches are reported per fixture.
+
+Usage: python -m simulation.validate [--candidate batch|analytic] [--samples N]
+"""
+
+import argparse
+import math
+import random
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .engine import MatchSimulator, TeamState, create_sample_team, outcome_distribution
+
+Samples = Dict[str, List[float]]
+Engine = Callable[[TeamState, TeamState, int, int], Samples]
+
+DISCRETE_METRICS = ["home_goals", "away_goals", "home_shots", "away_shots", "home_sot", "away_sot"]
+CONTINUOUS_METRICS = ["home_xg", "away_xg"]
+
+
+def reference_samples(home: TeamState, away: TeamState, n: int, seed: int) -> Samples:
+    """n replays of the fixture on the scalar MatchSimulator"""
+    rng = random.Random(seed)
+    samples: Samples = {metric: [] for metric in DISCRETE_METRICS + CONTINUOUS_METRICS}
+    for _ in range(n):
+        result = MatchSimulator(home, away, rng=rng).simulate(detail_level="summary")
+        samples["home_goals"].append(result.home_score)
+        samples["away_goals"].append(result.away_score)
+        samples["home_xg"].append(result.home_xg)
+        samples["away_xg"].append(result.away_xg)
+        samples["home_shots"].append(result.shots[0])
+        samples["away_shots"].append(result.shots[1])
+        samples["home_sot"].append(result.shots_on_target[0])
+        samples["away_sot"].append(result.shots_on_target[1])
+    return samples
+
+
+def batch_samples(home: TeamState, away: TeamState, n: int, seed: int) -> Samples:
+    """n replays of the fixture on the NumPy BatchMatchSimulator"""
+    from .batch import BatchMatchSimulator
+
+    result = BatchMatchSimulator(seed=seed).simulate(home, away, n)
+    return {
+        "home_goals": result.home_score.tolist(),
+        "away_goals": result.away_score.tolist(),
+        "home_xg": result.home_xg.tolist(),
+        "away_xg": result.away_xg.tolist(),
+        "home_shots": result.home_shots.tolist(),
+        "away_shots": result.away_shots.tolist(),
+        "home_sot": result.home_sot.tolist(),
+        "away_sot": result.away_sot.tolist(),
+    }
+
+
+CANDIDATES: Dict[str, Engine] = {
+    "batch": batch_samples,
+}
+
+
+# --- Statistics -------------------------------------------------------------
+
+def _gamma_q(a: float, x: float) -> float:
+    """Regularized upper incomplete gamma Q(a, x)"""
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        # Series for P(a, x)
+        term = total = 1.0 / a
+        ap = a
+        for _ in range(1000):
+            ap += 1
+            term *= x / ap
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+
+    # Continued fraction for Q(a, x) (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefix) * h
+
+
+def chi_square_p_value(statistic: float, dof: int) -> float:
+    return _gamma_q(dof / 2, statistic / 2) if dof > 0 else 1.0
+
+
+def _pooled_bins(expected_counts: Sequence[float], min_expected: float = 5.0) -> List[Tuple[int, int]]:
+    """Merge adjacent value bins until each expects at least min_expected"""
+    bins = []
+    start, running = 0, 0.0
+    for i, count in enumerate(expected_counts):
+        running += count
+        if running >= min_expected:
+            bins.append((start, i + 1))
+            start, running = i + 1, 0.0
+    if start < len(expected_counts):
+        if bins:
+            bins[-1] = (bins[-1][0], len(expected_counts))
+        else:
+            bins.append((start, len(expected_counts)))
+    return bins
+
+
+def _histogram(values: Sequence[float], size: int) -> List[int]:
+    counts = [0] * size
+    for v in values:
+        counts[int(v)] += 1
+    return counts
+
+
+def chi_square_homogeneity(a: Sequence[float], b: Sequence[float]) -> Tuple[float, float]:
+    """Two-sample chi-square test on integer-valued samples; (statistic, p)"""
+    size = int(max(max(a), max(b))) + 1
+    counts_a, counts_b = _histogram(a, size), _histogram(b, size)
+    n_a, n_b = len(a), len(b)
+    total = n_a + n_b
+    pooled = [(x + y) * min(n_a, n_b) / total for x, y in zip(counts_a, counts_b)]
+
+    statistic = 0.0
+    bins = _pooled_bins(pooled)
+    for lo, hi in bins:
+        obs_a, obs_b = sum(counts_a[lo:hi]), sum(counts_b[lo:hi])
+        column = obs_a + obs_b
+        exp_a, exp_b = column * n_a / total, column * n_b / total
+        statistic += (obs_a - exp_a) ** 2 / exp_a + (obs_b - exp_b) ** 2 / exp_b
+    return statistic, chi_square_p_value(statistic, len(bins) - 1)
+
+
+def chi_square_goodness_of_fit(values: Sequence[float], pmf: Sequence[float]) -> Tuple[float, float]:
+    """Chi-square test of integer samples against a known pmf; (statistic, p)"""
+    n = len(values)
+    size = max(len(pmf), int(max(values)) + 1)
+    counts = _histogram(values, size)
+    expected = [p * n for p in pmf] + [0.0] * (size - len(pmf))
+
+    statistic = 0.0
+    bins = _pooled_bins(expected)
+    for lo, hi in bins:
+        obs, exp = sum(counts[lo:hi]), sum(expected[lo:hi])
+        if exp > 0:
+            statistic += (obs - exp) ** 2 / exp
+        elif obs:
+            return math.inf, 0.0
+    return statistic, chi_square_p_value(statistic, len(bins) - 1)
+
+
+def ks_two_sample(a: Sequence[float], b: Sequence[float]) -> Tuple[float, float]:
+    """Two-sample Kolmogorov-Smirnov test; (D, asymptotic p)"""
+    a, b = sorted(a), sorted(b)
+    n_a, n_b = len(a), len(b)
+    d = 0.0
+    for x in sorted(set(a) | set(b)):
+        d = max(d, abs(bisect_right(a, x) / n_a - bisect_right(b, x) / n_b))
+
+    en = math.sqrt(n_a * n_b / (n_a + n_b))
+    lam = (en + 0.12 + 0.11 / en) * d
+    if lam < 1e-3:
+        return d, 1.0
+    p = 2 * sum((-1) ** (k - 1) * math.exp(-2 * k * k * lam * lam) for k in range(1, 101))
+    return d, max(0.0, min(1.0, p))
+
+
+# --- Reports ----------------------------------------------------------------
+
+@dataclass
+class MetricCheck:
+    metric: str
+    test: str
+    statistic: float
+    p_value: float
+    passed: bool
+
+
+@dataclass
+class FixtureReport:
+    home_team: str
+    away_team: str
+    checks: List[MetricCheck] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return all(c.passed for c in self.checks)
+
+    @property
+    def mismatches(self) -> List[MetricCheck]:
+        return [c for c in self.checks if not c.passed]
+
+
+@dataclass
+class ValidationReport:
+    candidate: str
+    samples: int
+    alpha: float
+    fixtures: List[FixtureReport]
+
+    @property
+    def passed(self) -> bool:
+        return all(f.passed for f in self.fixtures)
+
+    def print_summary(self):
+        print(f"\nCandidate: {self.candidate} ({self.samples} samples per fixture, alpha={self.alpha})")
+        for fixture in self.fixtures:
+            status = "✅" if fixture.passed else "❌"
+            print(f"{status} {fixture.home_team} vs {fixture.away_team}")
+            for check in fixture.checks:
+                flag = "" if check.passed else "  <-- MISMATCH"
+                print(f"     {check.metric:<12} {check.test:<10} stat={check.statistic:9.4f} p={check.p_value:.4f}{flag}")
+
+
+def compare_samples(reference: Samples, candidate: Samples, alpha: float) -> List[MetricCheck]:
+    checks = []
+    for metric in DISCRETE_METRICS:
+        stat, p = chi_square_homogeneity(reference[metric], candidate[metric])
+        checks.append(MetricCheck(metric, "chi2", stat, p, p >= alpha))
+    for metric in CONTINUOUS_METRICS:
+        stat, p = ks_two_sample(reference[metric], candidate[metric])
+        checks.append(MetricCheck(metric, "ks", stat, p, p >= alpha))
+    return checks
+
+
+def check_analytic(home: TeamState, away: TeamState, reference: Samples, alpha: float) -> List[MetricCheck]:
+    dist = outcome_distribution(home, away)
+    checks = []
+    for metric, pmf in (("home_goals", dist.home_goals), ("away_goals", dist.away_goals)):
+        stat, p = chi_square_goodness_of_fit(reference[metric], pmf)
+        checks.append(MetricCheck(metric, "chi2-gof", stat, p, p >= alpha))
+    for metric, expected in (("home_xg", dist.home_xg), ("away_xg", dist.away_xg)):
+        values = reference[metric]
+        mean = sum(values) / len(values)
+        var = sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+        # xG is rounded to 2dp per match, so allow for that bias on top of sampling error
+        z = (mean - expected) / math.sqrt(var / len(values) + 0.005 ** 2)
+        p = math.erfc(abs(z) / math.sqrt(2))
+        checks.append(MetricCheck(metric, "z-mean", z, p, p >= alpha))
+    return checks
+
+
+def validate(fixtures: Sequence[Tuple[TeamState, TeamState]], candidate: str = "batch",
+             samples: int = 20000, alpha: float = 0.001, seed: int = 0) -> ValidationReport:
+    """Run the reference and candidate engines on every fixture and test for equivalence"""
+    reports = []
+    for i, (home, away) in enumerate(fixtures):
+        reference = reference_samples(home, away, samples, seed + 2 * i)
+        if candidate == "analytic":
+            checks = check_analytic(home, away, reference, alpha)
+        else:
+            checks = compare_samples(reference, CANDIDATES[candidate](home, away, samples, seed + 2 * i + 1), alpha)
+        reports.append(FixtureReport(home.name, away.name, checks))
+    return ValidationReport(candidate, samples, alpha, reports)
+
+
+def sample_fixtures(count: int, seed: int = 0) -> List[Tuple[TeamState, TeamState]]:
+    """Fixtures spanning mismatched and evenly matched sides"""
+    rng = random.Random(seed)
+    fixtures = []
+    for i in range(count):
+        home = create_sample_team(f"Home {i}", rng.randint(65, 90), rng=rng)
+        away = create_sample_team(f"Away {i}", rng.randint(65, 90), rng=rng)
+        fixtures.append((home, away))
+    return fixtures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check an optimized engine against MatchSimulator")
+    parser.add_argument("--candidate", choices=sorted(CANDIDATES) + ["analytic"], default="batch")
+    parser.add_argument("--samples", type=int, default=20000, help="replays per fixture and engine")
+    parser.add_argument("--fixtures", type=int, default=5)
+    parser.add_argument("--alpha", type=float, default=0.001, help="per-test significance level")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    report = validate(sample_fixtures(args.fixtures, args.seed), args.candidate,
+                      args.samples, args.alpha, args.seed)
+    report.print_summary()
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())